@@ -1,7 +1,12 @@
 """Extract command - export metrics to various output formats."""
 
 import argparse
+from functools import cache
+from itertools import chain, islice
 from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+from pydantic import TypeAdapter
 
 from ..cli_utils import (
     Verbosity,
@@ -12,6 +17,99 @@ from ..cli_utils import (
 )
 from ..formatters import csv_formatter, json_formatter
 from ..interop_reader import InterOpReader, MetricFile
+from ..models import BaseRecord
+
+
+@cache
+def _records_adapter(model: type[BaseRecord]) -> TypeAdapter[Sequence[BaseRecord]]:
+    return TypeAdapter(list[model])  # type: ignore[valid-type]
+
+
+def dump_records(records: Sequence[BaseRecord]) -> list[dict[str, Any]]:
+    """Convert records of one model to dicts, like `model_dump()` on each
+    record but in a single call."""
+    if not records:
+        return []
+    # The adapter is for a list, and would give back a tuple for a tuple
+    dumped: list[dict[str, Any]] = _records_adapter(type(records[0])).dump_python(
+        list(records)
+    )
+    return dumped
+
+
+def iter_dumped_records(
+    records: Iterable[BaseRecord], chunk_size: int = 65536
+) -> Iterator[dict[str, Any]]:
+    """Like `dump_records`, but converts the records a chunk at a time so they
+    can be streamed to a file."""
+    it = iter(records)
+    while chunk := list(islice(it, chunk_size)):
+        yield from dump_records(chunk)
+
+
+FORMATS = ["json", "csv", "parquet", "feather"]
+
+
+def write_metric(
+    reader: InterOpReader,
+    metric: MetricFile,
+    output_format: str,
+    output_path: Path | None,
+) -> int:
+    """Write one metric's records to `output_path` in `output_format`, and
+    return how many were written. Nothing is written if there are none.
+
+    Only JSON and CSV can be written to stdout, with an `output_path` of None.
+    """
+    if output_format == "parquet":
+        import pyarrow.parquet as pq
+
+        # Written a batch of rows at a time
+        tables = reader.iter_file_tables(metric)
+        first = next(tables, None)
+        if first is None:
+            return 0
+        record_count = 0
+        with pq.ParquetWriter(
+            output_path, first.schema, compression="snappy"
+        ) as writer:
+            for batch in chain([first], tables):
+                writer.write_table(batch)
+                record_count += batch.num_rows
+        return record_count
+
+    if output_format == "feather":
+        import pyarrow.feather as feather
+
+        table = reader.read_file_to_table(metric)
+        num_rows: int = table.num_rows
+        if num_rows:
+            feather.write_feather(
+                table, output_path, compression="zstd", compression_level=3
+            )
+        return num_rows
+
+    # Streamed, converting the records to dicts as they are written
+    records = iter_dumped_records(reader.iter_generic_records(metric))
+    if output_format == "csv":
+        return csv_formatter.format_output(records, output_path)
+
+    # Metadata, then the records
+    header = {"run_name": reader.run_name, "metric": metric.name}
+    return json_formatter.format_records_stream(header, records, output_path)
+
+
+def default_format(output: Path | None) -> str:
+    """Pick the output format when --format is not given.
+
+    Parquet is the most compact for the numeric metrics, so it is used for
+    any output path that doesn't name another format by its extension. JSON
+    is used for stdout.
+    """
+    if output is None:
+        return "json"
+    suffix = output.suffix.lstrip(".").lower()
+    return suffix if suffix in FORMATS else "parquet"
 
 
 def add_arguments(parser: argparse.ArgumentParser) -> None:
@@ -34,9 +132,11 @@ def add_arguments(parser: argparse.ArgumentParser) -> None:
     )
     parser.add_argument(
         "--format",
-        choices=["json", "csv", "parquet"],
-        default="json",
-        help="Output format (default: json)",
+        choices=FORMATS,
+        help=(
+            "Output format (default: from the output file extension, parquet for "
+            "a directory, or json when writing to stdout)"
+        ),
     )
     parser.add_argument(
         "-o",
@@ -51,6 +151,7 @@ def execute(args: argparse.Namespace) -> int:
     """Execute the extract command."""
     configure_verbosity(args)
     run_dir = args.run_dir
+    output_format = args.format or default_format(args.output)
 
     # Initialize reader
     try:
@@ -68,7 +169,7 @@ def execute(args: argparse.Namespace) -> int:
             if metric == MetricFile.SUMMARY_RUN:
                 continue  # Skip SUMMARY_RUN as it has no read method
             try:
-                metric.value.get_file(reader.interop_dir)
+                reader.get_file(metric)
                 metrics_to_extract.append(metric)
             except FileNotFoundError:
                 info(f"Skipping {metric.name} (not found)", Verbosity.VERBOSE)
@@ -80,7 +181,7 @@ def execute(args: argparse.Namespace) -> int:
                 info(f"Warning: Skipping {metric_name} (no read method available)")
                 continue
             try:
-                metric.value.get_file(reader.interop_dir)
+                reader.get_file(metric)
                 metrics_to_extract.append(metric)
             except FileNotFoundError:
                 error(f"Error: {metric_name} file not found in {reader.interop_dir}")
@@ -103,62 +204,26 @@ def execute(args: argparse.Namespace) -> int:
         try:
             info(f"Extracting {metric.name}...", Verbosity.VERBOSE)
 
-            # Read the metric data
-            records = reader.read_generic_records(metric)
-
-            if not records:
+            # Determine output path
+            if len(metrics_to_extract) == 1 and (
+                args.output or output_format == "json"
+            ):
+                output_path = args.output
+            else:
+                output_dir = args.output or Path(".")
+                output_dir.mkdir(parents=True, exist_ok=True)
+                output_path = output_dir / f"{metric.name.lower()}.{output_format}"
+
+            # Empty fixed-width files can be skipped from their size alone
+            if reader.record_count(metric) == 0:
+                record_count = 0
+            else:
+                record_count = write_metric(reader, metric, output_format, output_path)
+
+            if not record_count:
                 info(f"  Warning: No records found for {metric.name}", Verbosity.VERBOSE)
                 continue
-
-            # Convert to appropriate format
-            if args.format == "parquet":
-                df = reader.read_file_to_dataframe(metric)
-
-                # Determine output path
-                if len(metrics_to_extract) == 1 and args.output:
-                    output_path = args.output
-                else:
-                    output_dir = args.output or Path(".")
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    output_path = output_dir / f"{metric.name.lower()}.parquet"
-
-                df.to_parquet(output_path, index=False)
-                info(f"  ✓ Saved to {output_path} ({len(records)} records)", Verbosity.VERBOSE)
-
-            elif args.format == "csv":
-                # Convert records to list of dicts
-                csv_data = [record.model_dump() for record in records]
-
-                # Determine output path
-                if len(metrics_to_extract) == 1 and args.output:
-                    output_path = args.output
-                else:
-                    output_dir = args.output or Path(".")
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    output_path = output_dir / f"{metric.name.lower()}.csv"
-
-                csv_formatter.format_output(csv_data, output_path)
-                info(f"  ✓ Saved to {output_path} ({len(records)} records)", Verbosity.VERBOSE)
-
-            else:  # json
-                # Convert records to dict with metadata
-                json_data = {
-                    "run_name": reader.run_name,
-                    "metric": metric.name,
-                    "record_count": len(records),
-                    "records": [record.model_dump() for record in records],
-                }
-
-                # Determine output path
-                if len(metrics_to_extract) == 1:
-                    output_path = args.output
-                else:
-                    output_dir = args.output or Path(".")
-                    output_dir.mkdir(parents=True, exist_ok=True)
-                    output_path = output_dir / f"{metric.name.lower()}.json"
-
-                json_formatter.format_output(json_data, output_path)
-                info(f"  ✓ Saved to {output_path} ({len(records)} records)", Verbosity.VERBOSE)
+            info(f"  ✓ Saved to {output_path} ({record_count} records)", Verbosity.VERBOSE)
 
         except Exception as e:
             error(f"Error extracting {metric.name}: {e}")
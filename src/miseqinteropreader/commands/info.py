@@ -50,7 +50,7 @@ def execute(args: argparse.Namespace) -> int:
     available_metrics = []
     for metric in MetricFile:
         try:
-            metric.value.get_file(reader.interop_dir)
+            reader.get_file(metric)
             available_metrics.append(metric)
         except FileNotFoundError:
             pass
@@ -96,7 +96,7 @@ def execute(args: argparse.Namespace) -> int:
     info("\nAvailable metric files:", Verbosity.VERBOSE)
     for metric in available_metrics:
         try:
-            metric_file = metric.value.get_file(reader.interop_dir)
+            metric_file = reader.get_file(metric)
             file_size = metric_file.stat().st_size
             info(
                 f"  • {metric.name}: {metric_file.name} ({file_size:,} bytes)",
@@ -4,6 +4,8 @@ import argparse
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from ..cli_utils import (
     Verbosity,
     add_verbosity_arguments,
@@ -130,7 +132,7 @@ def execute(args: argparse.Namespace) -> int:
     # Generate quality summary
     if generate_quality:
         try:
-            records = reader.read_quality_records()
+            records = reader.read_generic_array(MetricFile.QUALITY_METRICS)
             quality_summary = reader.summarize_quality_records(records, read_lengths)
             summary_data["quality"] = {
                 "total_count": quality_summary.total_count,
@@ -154,7 +156,7 @@ def execute(args: argparse.Namespace) -> int:
     # Generate tile summary
     if generate_tiles:
         try:
-            tile_records = reader.read_tile_records()
+            tile_records = reader.read_generic_array(MetricFile.TILE_METRICS)
             tile_summary = reader.summarize_tile_records(tile_records)
             summary_data["tiles"] = {
                 "density_count": tile_summary.density_count,
@@ -178,14 +180,11 @@ def execute(args: argparse.Namespace) -> int:
     # Generate error summary
     if generate_errors:
         try:
-            error_records = reader.read_error_records()
-
-            # Calculate error summary manually
-            error_sum_forward = 0.0
-            error_count_forward = 0
-            error_sum_reverse = 0.0
-            error_count_reverse = 0
+            error_records = reader.read_generic_array(MetricFile.ERROR_METRICS)
+            cycles = error_records["cycle"]
+            error_rates = error_records["error_rate"].astype(np.float64)
 
+            # Calculate error summary over the cycle masks
             if read_lengths:
                 # Convert ReadLengths4 to ReadLengths3 if needed
                 if isinstance(read_lengths, ReadLengths4):
@@ -194,18 +193,17 @@ def execute(args: argparse.Namespace) -> int:
                 last_forward_cycle = read_lengths.forward_read
                 first_reverse_cycle = read_lengths.forward_read + read_lengths.indexes_combined + 1
 
-                for record in error_records:
-                    if record.cycle <= last_forward_cycle:
-                        error_sum_forward += record.error_rate
-                        error_count_forward += 1
-                    elif record.cycle >= first_reverse_cycle:
-                        error_sum_reverse += record.error_rate
-                        error_count_reverse += 1
+                forward = cycles <= last_forward_cycle
+                reverse = cycles >= first_reverse_cycle
             else:
                 # Without read lengths, treat all as forward
-                for record in error_records:
-                    error_sum_forward += record.error_rate
-                    error_count_forward += 1
+                forward = np.ones(len(cycles), dtype=bool)
+                reverse = ~forward
+
+            error_sum_forward = float(error_rates[forward].sum())
+            error_count_forward = int(forward.sum())
+            error_sum_reverse = float(error_rates[reverse].sum())
+            error_count_reverse = int(reverse.sum())
 
             error_rate_forward = (
                 error_sum_forward / error_count_forward if error_count_forward else 0
@@ -95,7 +95,7 @@ def execute(args: argparse.Namespace) -> int:
     for metric in MetricFile:
         total_count += 1
         try:
-            metric_file = metric.value.get_file(reader.interop_dir)
+            metric_file = reader.get_file(metric)
             info(f"✓ {metric.name}")
             available_count += 1
             info(f"  -> {metric_file.name}", Verbosity.VERBOSE)
@@ -1,35 +1,53 @@
 """CSV output formatter."""
 
 import csv
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 
 
 def format_output(
-    data: list[dict[str, Any]], output_file: str | Path | None = None
-) -> None:
+    data: Iterable[dict[str, Any]], output_file: str | Path | None = None
+) -> int:
     """Format data as CSV and write to file or stdout.
 
+    Rows are written as they are read from `data`, so it can be a generator.
+
     Args:
-        data: List of dictionaries to format as CSV rows
+        data: Dictionaries to format as CSV rows
         output_file: Output file path, or None for stdout
+
+    Returns:
+        The number of rows written
     """
-    if not data:
-        return
+    rows = iter(data)
+    first = next(rows, None)
+    if first is None:
+        return 0
 
     # Get all unique keys from all dictionaries
-    fieldnames = list(data[0].keys())
+    fieldnames = list(first.keys())
+
+    count = 0
+
+    def counted() -> Iterator[dict[str, Any]]:
+        nonlocal count
+        for row in chain([first], rows):
+            count += 1
+            yield row
 
     if output_file:
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, "w", newline="") as f:
+        with open(output_path, "w", newline="", buffering=1 << 20) as f:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
-            writer.writerows(data)
+            writer.writerows(counted())
     else:
         import sys
 
         writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(data)
+        writer.writerows(counted())
+
+    return count
@@ -1,9 +1,54 @@
 """JSON output formatter."""
 
 import json
+import math
 import sys
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
+
+import numpy as np
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover
+    HAS_ORJSON = False
+
+
+def _has_non_finite(data: Any) -> bool:
+    if isinstance(data, (float, np.floating)):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(map(_has_non_finite, data.values()))
+    if isinstance(data, (list, tuple)):
+        return any(map(_has_non_finite, data))
+    if isinstance(data, np.ndarray) and data.dtype.kind in "fc":
+        return not np.isfinite(data).all()
+    return False
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize data to JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: Data to serialize (must be JSON-serializable, or convertible
+            with str())
+    """
+    # orjson writes NaN and infinities as null, so data holding them goes
+    # through the stdlib, which writes NaN, Infinity and -Infinity.
+    if HAS_ORJSON and not _has_non_finite(data):
+        # Same layout as the stdlib fallback: two-space indents, datetimes and
+        # other unknown types rendered with str().
+        options = (
+            orjson.OPT_INDENT_2
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_SERIALIZE_NUMPY
+        )
+        return orjson.dumps(data, default=str, option=options)
+    return json.dumps(data, indent=2, default=str).encode()
 
 
 def format_output(data: Any, output_file: str | Path | None = None) -> None:
@@ -13,11 +58,66 @@ def format_output(data: Any, output_file: str | Path | None = None) -> None:
         data: Data to format (must be JSON-serializable)
         output_file: Output file path, or None for stdout
     """
-    json_str = json.dumps(data, indent=2, default=str)
+    json_bytes = dumps(data)
 
     if output_file:
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(json_str)
+        output_path.write_bytes(json_bytes)
     else:
-        print(json_str)
+        print(json_bytes.decode())
+
+
+def _write_records(
+    write: Callable[[bytes], object],
+    header: dict[str, Any],
+    rows: Iterator[dict[str, Any]],
+) -> int:
+    # Lay the object out exactly as dumps() would, with the records nested one
+    # level under "records" and the count appended once it is known.
+    opening = dumps(header)[:-2] + b"," if header else b"{"
+    write(opening + b'\n  "records": [')
+    count = 0
+    for row in rows:
+        separator = b"," if count else b""
+        write(separator + b"\n    " + dumps(row).replace(b"\n", b"\n    "))
+        count += 1
+    write(b'\n  ],\n  "record_count": %d\n}' % count)
+    return count
+
+
+def format_records_stream(
+    header: dict[str, Any],
+    records: Iterable[dict[str, Any]],
+    output_file: str | Path | None = None,
+) -> int:
+    """Write records as the "records" list of a JSON object, one at a time.
+
+    Records are serialized as they are read from `records`, so it can be a
+    generator. The object holds the `header` items, then "records", then a
+    "record_count". Nothing is written if there are no records.
+
+    Args:
+        header: Items to write before the records
+        records: Dictionaries to write as the records
+        output_file: Output file path, or None for stdout
+
+    Returns:
+        The number of records written
+    """
+    rows = iter(records)
+    first = next(rows, None)
+    if first is None:
+        return 0
+
+    if output_file:
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "wb", buffering=1 << 20) as f:
+            return _write_records(f.write, header, chain([first], rows))
+
+    count = _write_records(
+        lambda chunk: sys.stdout.write(chunk.decode()), header, chain([first], rows)
+    )
+    sys.stdout.write("\n")
+    return count
@@ -17,20 +17,28 @@ def format_output(data: dict[str, Any] | list[dict[str, Any]]) -> None:
     elif isinstance(data, list) and data:
         # List of dictionaries - format as table
         fieldnames = list(data[0].keys())
-        
+
+        # Convert each cell to text once, for both the widths and the rows
+        header_cells = [str(field) for field in fieldnames]
+        rows = [[str(row.get(field, "")) for field in fieldnames] for row in data]
+
         # Calculate column widths
-        col_widths = {
-            field: max(len(str(field)), max(len(str(row.get(field, ""))) for row in data))
-            for field in fieldnames
-        }
-        
+        col_widths = [
+            max(len(name), max(map(len, column)))
+            for name, column in zip(header_cells, zip(*rows))
+        ]
+
         # Print header
-        header = " | ".join(str(field).ljust(col_widths[field]) for field in fieldnames)
-        print(header)
-        print("-" * len(header))
-        
+        header = " | ".join(
+            cell.ljust(width) for cell, width in zip(header_cells, col_widths)
+        )
+        lines = [header, "-" * len(header)]
+
         # Print rows
-        for row in data:
-            print(" | ".join(str(row.get(field, "")).ljust(col_widths[field]) for field in fieldnames))
+        lines.extend(
+            " | ".join(cell.ljust(width) for cell, width in zip(cells, col_widths))
+            for cells in rows
+        )
+        print("\n".join(lines))
     else:
         print("No data to display")
@@ -1,13 +1,18 @@
 import logging
+import os
 from enum import Enum
+from functools import cached_property
 from io import BufferedReader
+from itertools import islice
 from pathlib import Path
-from typing import Callable, Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Callable, Container, Iterable, Iterator, Sequence
 
-import pandas as pd
+import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel
 
 from .models import (
+    QUALITY_BIN_FIELDS,
     BaseMetricRecord,
     BaseRecord,
     CollapsedQRecord,
@@ -26,6 +31,8 @@ from .models import (
     TileMetricSummary,
 )
 from .read_records import (
+    BinaryFormat,
+    count_records,
     read_collapsed_q_metric,
     read_corrected_intensities,
     read_errors,
@@ -34,33 +41,164 @@ from .read_records import (
     read_index,
     read_phasing,
     read_quality,
+    read_records_array,
     read_tiles,
 )
 
+if TYPE_CHECKING:
+    # pandas and pyarrow (and numpy.lib.recfunctions, which pulls in numpy.ma)
+    # are slow to import and only needed by a few methods, so they are
+    # imported where they are used.
+    import pandas as pd
+    import pyarrow as pa
+
 
 class Metric(BaseModel):
     """
     Class that holds the valid filenames, the model that should be used
-    to hold data, and the method which to read the data into the model.
+    to hold data, the method which to read the data into the model, and the
+    binary layout of fixed-width files.
     """
 
     files: Sequence[str]
     model: type[BaseRecord]
     read_method: Callable[[BufferedReader], Iterator[BaseRecord]] | None = None
+    binary_format: BinaryFormat | None = None
+
+    def get_file(
+        self, interop_dir: Path, filenames: Container[str] | None = None
+    ) -> Path:
+        """Find the file for this metric in `interop_dir`.
 
-    def get_file(self, interop_dir: Path) -> Path:
+        :param filenames: the names already listed in `interop_dir`, if known,
+            so the candidates are looked up there instead of on disk.
+        """
         for filename in self.files:
-            if (interop_dir / filename).exists():
+            if filenames is None:
+                found = (interop_dir / filename).exists()
+            else:
+                found = filename in filenames
+            if found:
                 return interop_dir / filename
         raise FileNotFoundError(
             f"Could not find {'/'.join(self.files)} in {interop_dir}"
         )
 
-    def read_file(self, interop_dir: Path) -> Sequence[BaseRecord]:
+    def iter_records(
+        self, interop_dir: Path, filenames: Container[str] | None = None
+    ) -> Iterator[BaseRecord]:
+        """Read the records one at a time. The file stays open until the
+        iterator is exhausted or closed.
+
+        Like the other read methods, this takes the `filenames` already listed
+        in `interop_dir`, if known, and passes them to `get_file`.
+        """
         if self.read_method is None:
             raise ReferenceError("No associated read method for this type!")
-        with open(self.get_file(interop_dir), mode="rb") as f:
-            return list(self.read_method(f))
+        file = self.get_file(interop_dir, filenames)
+        with open(file, mode="rb") as f:
+            yield from self.read_method(f)
+
+    def read_file(
+        self, interop_dir: Path, filenames: Container[str] | None = None
+    ) -> Sequence[BaseRecord]:
+        return list(self.iter_records(interop_dir, filenames))
+
+    def record_count(
+        self, interop_dir: Path, filenames: Container[str] | None = None
+    ) -> int | None:
+        """Count the records in a fixed-width file from its header and size,
+        without reading them. Returns None when records vary in width."""
+        if self.binary_format is None:
+            return None
+        with open(self.get_file(interop_dir, filenames), mode="rb") as f:
+            return count_records(f, self.binary_format)
+
+    def read_array(
+        self, interop_dir: Path, filenames: Container[str] | None = None
+    ) -> npt.NDArray[np.void]:
+        """Read the whole file into a numpy structured array, one element per
+        record, without building a model for each record."""
+        if self.binary_format is None:
+            raise ReferenceError("No fixed record layout for this type!")
+        with open(self.get_file(interop_dir, filenames), mode="rb") as f:
+            return read_records_array(f, self.binary_format)
+
+    def read_file_to_dataframe(
+        self, interop_dir: Path, filenames: Container[str] | None = None
+    ) -> "pd.DataFrame":
+        """Read the file into a dataframe with one column per `model_dump()` key.
+
+        Fixed-width files are converted straight from the structured array,
+        plus the model's `derived_columns`, unless the model adds computed
+        fields to its dump.
+        """
+        import pandas as pd
+
+        if self.binary_format is None or self.model.model_computed_fields:
+            data = self.read_file(interop_dir, filenames)
+            return pd.DataFrame(data=[el.model_dump() for el in data])
+        array = self.read_array(interop_dir, filenames)
+        return pd.DataFrame(self._array_columns(array))
+
+    def read_file_to_table(
+        self, interop_dir: Path, filenames: Container[str] | None = None
+    ) -> "pa.Table":
+        """Read the file into an arrow table with the same columns as
+        `read_file_to_dataframe`, without going through pandas when the file
+        is fixed-width."""
+        import pyarrow as pa
+
+        if self.binary_format is None or self.model.model_computed_fields:
+            return pa.Table.from_pandas(
+                self.read_file_to_dataframe(interop_dir, filenames),
+                preserve_index=False,
+            )
+        array = self.read_array(interop_dir, filenames)
+        return pa.Table.from_pydict(self._array_columns(array))
+
+    def iter_tables(
+        self,
+        interop_dir: Path,
+        batch_size: int = 65536,
+        filenames: Container[str] | None = None,
+    ) -> Iterator["pa.Table"]:
+        """Read the file as arrow tables of up to `batch_size` rows each, with
+        the same columns as `read_file_to_table`, so it can be written out
+        without holding the whole file in memory."""
+        import pyarrow as pa
+
+        if self.binary_format is None or self.model.model_computed_fields:
+            records = self.iter_records(interop_dir, filenames)
+            while chunk := list(islice(records, batch_size)):
+                yield pa.Table.from_pylist([el.model_dump() for el in chunk])
+            return
+        array = self.read_array(interop_dir, filenames)
+        for start in range(0, len(array), batch_size):
+            batch = array[start : start + batch_size]
+            yield pa.Table.from_pydict(self._array_columns(batch))
+
+    def _array_columns(self, array: npt.NDArray[np.void]) -> dict[str, np.ndarray]:
+        """Split a structured array into the columns `model_dump()` gives.
+
+        The on-disk widths are widened to int64 and float64, the types pandas
+        and arrow infer from the Python ints and floats of `model_dump()`.
+        Like that inference, uint64 columns stay unsigned if a value (such as
+        the kind bits of an extraction datestamp) does not fit in an int64.
+        """
+        int64_max = np.iinfo(np.int64).max
+        columns: dict[str, np.ndarray] = {}
+        for name in array.dtype.names or ():
+            column = array[name]
+            if column.dtype.kind == "i" or (
+                column.dtype.kind == "u" and not (column > int64_max).any()
+            ):
+                column = column.astype(np.int64)
+            elif column.dtype.kind == "f":
+                column = column.astype(np.float64)
+            columns[name] = column
+        columns.update(self.model.derived_columns(array))
+        return columns
 
 
 class MetricFile(Enum):
@@ -75,46 +213,55 @@ class MetricFile(Enum):
         ],
         model=CorrectedIntensityRecord,
         read_method=read_corrected_intensities,
+        binary_format=BinaryFormat.CORRECTEDINTENSITY,
     )
     ERROR_METRICS = Metric(
         files=["ErrorMetrics.bin", "ErrorMetricsOut.bin"],
         model=ErrorRecord,
         read_method=read_errors,
+        binary_format=BinaryFormat.ERROR,
     )
     EXTENDED_TILE_METRICS = Metric(
         files=["ExtendedTileMetrics.bin", "ExtendedTileMetricsOut.bin"],
         model=TileMetricRecord,
         read_method=read_tiles,
+        binary_format=BinaryFormat.TILE,
     )
     EXTRACTION_METRICS = Metric(
         files=["ExtractionMetrics.bin", "ExtractionMetricsOut.bin"],
         model=ExtractionRecord,
         read_method=read_extractions,
+        binary_format=BinaryFormat.EXTRACTION,
     )
     IMAGE_METRICS = Metric(
         files=["ImageMetrics.bin", "ImageMetricsOut.bin"],
         model=ImageRecord,
         read_method=read_images,
+        binary_format=BinaryFormat.IMAGE,
     )
     PHASING_METRICS = Metric(
         files=["EmpiricalPhasingMetrics.bin", "EmpiricalPhasingMetricsOut.bin"],
         model=PhasingRecord,
         read_method=read_phasing,
+        binary_format=BinaryFormat.PHASING,
     )
     QUALITY_METRICS = Metric(
         files=["QMetrics.bin", "QMetricsOut.bin"],
         model=QualityRecord,
         read_method=read_quality,
+        binary_format=BinaryFormat.QUALITY,
     )
     TILE_METRICS = Metric(
         files=["TileMetrics.bin", "TileMetricsOut.bin"],
         model=TileMetricRecord,
         read_method=read_tiles,
+        binary_format=BinaryFormat.TILE,
     )
     COLLAPSED_Q_METRICS = Metric(
         files=["QMetrics2030.bin", "QMetrics2030Out.bin"],
         model=CollapsedQRecord,
         read_method=read_collapsed_q_metric,
+        binary_format=BinaryFormat.COLLAPSEDQ,
     )
     INDEX_METRICS = Metric(
         files=["IndexMetrics.bin", "IndexMetricsOut.bin"],
@@ -145,27 +292,39 @@ class InterOpReader:
         if isinstance(run_dir, str):
             run_dir = Path(run_dir)
 
-        if not run_dir.exists():
-            raise FileNotFoundError("Filepath does not exist.")
-        if not run_dir.is_dir():
-            raise NotADirectoryError("Filepath provided is not a directory.")
-
-        samplesheet_path = run_dir / "SampleSheet.csv"
-        if not samplesheet_path.exists():
+        # One listing of the run folder answers every check below.
+        try:
+            with os.scandir(run_dir) as it:
+                entries = {entry.name: entry for entry in it}
+        except FileNotFoundError:
+            raise FileNotFoundError("Filepath does not exist.") from None
+        except NotADirectoryError:
+            raise NotADirectoryError("Filepath provided is not a directory.") from None
+
+        if "SampleSheet.csv" not in entries:
             raise FileNotFoundError(f"SampleSheet.csv does not exist in {run_dir}")
 
-        interop_dir = run_dir / "InterOp"
-        if interop_dir.exists() and interop_dir.is_dir():
-            self.interop_dir = interop_dir
+        interop_entry = entries.get("InterOp")
+        if interop_entry is not None and interop_entry.is_dir():
+            self.interop_dir = run_dir / "InterOp"
         else:
             raise FileNotFoundError(f"InterOp directory does not exist in {run_dir}")
 
-        needsprocessing_marker = run_dir / "needsprocessing"
-        qc_uploaded_marker = run_dir / "qc_uploaded"
-
         self.run_name = run_dir.name
-        self.needsprocessing = needsprocessing_marker.exists()
-        self.qc_uploaded = qc_uploaded_marker.exists()
+        self.needsprocessing = "needsprocessing" in entries
+        self.qc_uploaded = "qc_uploaded" in entries
+        self._records: dict[MetricFile, tuple[BaseRecord, ...]] = {}
+
+    @cached_property
+    def interop_filenames(self) -> frozenset[str]:
+        """Names of the entries in the InterOp directory, listed once."""
+        return frozenset(os.listdir(self.interop_dir))
+
+    def get_file(self, metric: MetricFile) -> Path:
+        """
+        Finds the file for the specified Metric in the InterOp directory.
+        """
+        return metric.value.get_file(self.interop_dir, self.interop_filenames)
 
     def check_files_present(self, metric_files: Iterable[MetricFile]) -> bool:
         """
@@ -173,7 +332,7 @@ class InterOpReader:
         """
         try:
             for metric in metric_files:
-                metric.value.get_file(self.interop_dir)
+                self.get_file(metric)
             return True
         except FileNotFoundError as e:
             logging.error(e)
@@ -183,16 +342,64 @@ class InterOpReader:
         """
         Reads specified Metric file and returns a list of *MetricRecords, the
         type of which is defiend in `MetricFile.model`.
+
+        Each file is only parsed once per reader; later calls return the same
+        records, as a tuple so that callers can't modify the cached copy.
+        """
+        records = self._records.get(metric)
+        if records is None:
+            records = self._records[metric] = tuple(
+                metric.value.read_file(self.interop_dir, self.interop_filenames)
+            )
+        return records
+
+    def record_count(self, metric: MetricFile) -> int | None:
+        """
+        Counts the records in the specified fixed-width Metric file without
+        reading them, or returns None if the records vary in width.
+        """
+        return metric.value.record_count(self.interop_dir, self.interop_filenames)
+
+    def iter_generic_records(self, metric: MetricFile) -> Iterator[BaseRecord]:
+        """
+        Reads the specified Metric file one record at a time, without holding
+        every record in memory.
         """
-        return metric.value.read_file(self.interop_dir)
+        return metric.value.iter_records(self.interop_dir, self.interop_filenames)
 
-    def read_file_to_dataframe(self, metric: MetricFile) -> pd.DataFrame:
+    def read_generic_array(self, metric: MetricFile) -> npt.NDArray[np.void]:
+        """
+        Reads the specified fixed-width Metric file into a numpy structured
+        array, with one field per column of `MetricFile.model`.
+        """
+        return metric.value.read_array(self.interop_dir, self.interop_filenames)
+
+    def read_file_to_dataframe(self, metric: MetricFile) -> "pd.DataFrame":
         """
         Reads the specified Metric file and returns a dataframe, based on the
         `MetricFile.model`.
         """
-        data = metric.value.read_file(self.interop_dir)
-        return pd.DataFrame(data=[el.model_dump() for el in data])
+        return metric.value.read_file_to_dataframe(
+            self.interop_dir, self.interop_filenames
+        )
+
+    def read_file_to_table(self, metric: MetricFile) -> "pa.Table":
+        """
+        Reads the specified Metric file and returns an arrow table, with the
+        same columns as `read_file_to_dataframe`.
+        """
+        return metric.value.read_file_to_table(self.interop_dir, self.interop_filenames)
+
+    def iter_file_tables(
+        self, metric: MetricFile, batch_size: int = 65536
+    ) -> Iterator["pa.Table"]:
+        """
+        Reads the specified Metric file as arrow tables of up to `batch_size`
+        rows, with the same columns as `read_file_to_table`.
+        """
+        return metric.value.iter_tables(
+            self.interop_dir, batch_size, self.interop_filenames
+        )
 
     def read_quality_records(self) -> Sequence[QualityRecord]:
         """Read quality metrics and return typed records."""
@@ -240,78 +447,81 @@ class InterOpReader:
         return [record for record in records if isinstance(record, IndexRecord)]
 
     def summarize_tile_records(
-        self, records: Sequence[TileMetricRecord]
+        self, records: Sequence[TileMetricRecord] | npt.NDArray[np.void]
     ) -> TileMetricSummary:
         """Summarize the records from a tile metrics file.
 
-        :param records: a sequence of dictionaries from read_tiles()
-        :param dict summary: a dictionary to hold the summary values:
-        cluster_density and pass_rate.
+        :param records: a sequence of records from read_tiles(), or the
+            structured array from `read_generic_array(MetricFile.TILE_METRICS)`.
+        :return: TileMetricSummary with cluster_density and pass_rate.
         """
-        density_sum = 0.0
-        density_count = 0
-        total_clusters = 0.0
-        passing_clusters = 0.0
-
-        for record in records:
-            if record.metric_code == TileMetricCodes.CLUSTER_DENSITY:
-                density_sum += record.metric_value
-                density_count += 1
-            elif record.metric_code == TileMetricCodes.CLUSTER_COUNT:
-                total_clusters += record.metric_value
-            elif record.metric_code == TileMetricCodes.CLUSTER_COUNT_PASSING_FILTERS:
-                passing_clusters += record.metric_value
+        if isinstance(records, np.ndarray):
+            codes = records["metric_code"]
+            values = records["metric_value"].astype(np.float64)
+        else:
+            codes = np.array([record.metric_code for record in records], dtype=np.int64)
+            values = np.array(
+                [record.metric_value for record in records], dtype=np.float64
+            )
+
+        density = codes == TileMetricCodes.CLUSTER_DENSITY
+        total = codes == TileMetricCodes.CLUSTER_COUNT
+        passing = codes == TileMetricCodes.CLUSTER_COUNT_PASSING_FILTERS
 
         return TileMetricSummary(
-            density_count=density_count,
-            density_sum=density_sum,
-            total_clusters=total_clusters,
-            passing_clusters=passing_clusters,
+            density_count=int(density.sum()),
+            density_sum=float(values[density].sum()),
+            total_clusters=float(values[total].sum()),
+            passing_clusters=float(values[passing].sum()),
         )
 
     def summarize_quality_records(
         self,
-        records: Sequence[QualityRecord],
+        records: Sequence[QualityRecord] | npt.NDArray[np.void],
         read_lengths: ReadLengths3 | ReadLengths4 | None = None,
     ) -> QualityMetricsSummary:
         """Calculate the portion of clusters and cycles with quality >= 30
         (`quality_bins[29:]`).
 
-        :param records: a sequence of QualityRecord objects.
+        :param records: a sequence of QualityRecord objects, or the structured
+            array from `read_generic_array(MetricFile.QUALITY_METRICS)`.
         :param read_lengths: ReadLengths3 or ReadLengths4 specifying the read structure.
             If None, all cycles are treated as forward reads.
         :return: QualityMetricsSummary with q30_forward and q30_reverse statistics.
         """
-        total_count = 0
-        total_reverse = 0
-        good_count = 0
-        good_reverse = 0
-        last_forward_cycle = None
-        first_reverse_cycle = None
-
-        if read_lengths is not None:
+        bin_fields = list(QUALITY_BIN_FIELDS)
+        if isinstance(records, np.ndarray):
+            from numpy.lib.recfunctions import structured_to_unstructured
+
+            cycles = records["cycle"]
+            bins = structured_to_unstructured(records[bin_fields])
+        else:
+            cycles = np.array([record.cycle for record in records], dtype=np.int64)
+            bins = np.array(
+                [record.quality_bins for record in records], dtype=np.int64
+            ).reshape(len(records), len(bin_fields))
+
+        cycle_clusters = bins.sum(axis=1, dtype=np.int64)
+        cycle_good = bins[:, 29:].sum(axis=1, dtype=np.int64)
+
+        if read_lengths is None:
+            forward = np.ones(len(cycles), dtype=bool)
+            reverse = ~forward
+        else:
             # Convert ReadLengths4 to ReadLengths3 if needed
             if isinstance(read_lengths, ReadLengths4):
                 read_lengths = read_lengths.to_read_lengths_3()
 
             last_forward_cycle = read_lengths.forward_read
-            first_reverse_cycle = read_lengths.forward_read + read_lengths.indexes_combined + 1
-
-        for record in records:
-            cycle = record.cycle
-            cycle_clusters = sum(record.quality_bins)
-            cycle_good = sum(record.quality_bins[29:])
-
-            if last_forward_cycle is None or cycle <= last_forward_cycle:
-                total_count += cycle_clusters
-                good_count += cycle_good
-            elif first_reverse_cycle is not None and cycle >= first_reverse_cycle:
-                total_reverse += cycle_clusters
-                good_reverse += cycle_good
+            first_reverse_cycle = (
+                read_lengths.forward_read + read_lengths.indexes_combined + 1
+            )
+            forward = cycles <= last_forward_cycle
+            reverse = cycles >= first_reverse_cycle
 
         return QualityMetricsSummary(
-            total_count=total_count,
-            total_reverse=total_reverse,
-            good_count=good_count,
-            good_reverse=good_reverse,
+            total_count=int(cycle_clusters[forward].sum()),
+            total_reverse=int(cycle_clusters[reverse].sum()),
+            good_count=int(cycle_good[forward].sum()),
+            good_reverse=int(cycle_good[reverse].sum()),
         )
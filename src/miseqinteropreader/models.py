@@ -1,8 +1,10 @@
 from datetime import datetime, timedelta
-from functools import cached_property
+from functools import cache, cached_property
 from math import isclose
 from typing import Annotated, Any, Sequence, TypeAlias
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import (
     AfterValidator,
     BaseModel,
@@ -13,40 +15,32 @@ from pydantic import (
 )
 
 
-def assert_uint8(v: int) -> int:
-    assert 0 <= v < 2**8, f"Integer must be between 0 and {2**8-1}"
-    return v
-
-
-def assert_uint16(v: int) -> int:
-    assert 0 <= v < 2**16, f"Integer must be between 0 and {2**16-1}"
-    return v
-
-
-def assert_uint32(v: int) -> int:
-    assert 0 <= v < 2**32, f"Integer must be between 0 and {2**32-1}"
-    return v
-
-
-def assert_uint64(v: int) -> int:
-    assert 0 <= v < 2**64, f"Integer must be between 0 and {2**64-1}"
-    return v
-
-
 def value_is_non_negative(v: float | int) -> float | int:
     assert v >= 0, "This value must be positive"
     return v
 
 
-uint8 = Annotated[int, AfterValidator(assert_uint8)]
-uint16 = Annotated[int, AfterValidator(assert_uint16)]
-uint32 = Annotated[int, AfterValidator(assert_uint32)]
-uint64 = Annotated[int, AfterValidator(assert_uint64)]
+# Range constraints are checked by pydantic-core, not by a Python callback.
+uint8 = Annotated[int, Field(ge=0, lt=2**8)]
+uint16 = Annotated[int, Field(ge=0, lt=2**16)]
+uint32 = Annotated[int, Field(ge=0, lt=2**32)]
+uint64 = Annotated[int, Field(ge=0, lt=2**64)]
 float_positive = Annotated[float, AfterValidator(value_is_non_negative)]
 
 
 ###### Row record models
 
+# Low 62 bits of an extraction datestamp: 100ns ticks since 0001-01-01.
+_DATESTAMP_MASK = (1 << 62) - 1
+
+
+@cache
+def _comparison_fields(model: type[BaseModel]) -> tuple[tuple[str, bool], ...]:
+    """Field names of a model, each with whether it is compared as a float."""
+    return tuple(
+        (name, info.annotation is float) for name, info in model.model_fields.items()
+    )
+
 
 class BaseRecord(BaseModel):
     """Base record for all interop files"""
@@ -54,19 +48,26 @@ class BaseRecord(BaseModel):
     model_config = ConfigDict(frozen=True)
 
     def __eq__(self, other: Any) -> bool:
-        if isinstance(other, type(self)):
-            other_dict = other.model_dump()
-            self_dict = self.model_dump()
-            comparison_array = []
-            for k, info in type(self).model_fields.items():
-                if info.annotation is float:
-                    # we get into floating point innacuracies after 1e-7
-                    close_enough = isclose(self_dict[k], other_dict[k], rel_tol=1e-7)
-                    comparison_array.append(close_enough)
-                else:
-                    comparison_array.append(self_dict[k] == other_dict[k])
-            return all(comparison_array)
-        return False
+        if not isinstance(other, type(self)):
+            return False
+        for name, is_float in _comparison_fields(type(self)):
+            self_value = getattr(self, name)
+            other_value = getattr(other, name)
+            if is_float:
+                # we get into floating point innacuracies after 1e-7
+                if not isclose(self_value, other_value, rel_tol=1e-7):
+                    return False
+            elif self_value != other_value:
+                return False
+        return True
+
+    @classmethod
+    def derived_columns(
+        cls, records: npt.NDArray[np.void]
+    ) -> dict[str, npt.NDArray[Any]]:
+        """Extra columns computed from a structured array of this model's
+        fields, added to dataframe and table exports."""
+        return {}
 
 
 class BaseMetricRecord(BaseRecord):
@@ -124,7 +125,6 @@ class ExtractionRecord(BaseCycleMetricRecord):
     max_intensity_t: uint16
     datestamp: uint64
 
-    @computed_field  # type: ignore
     @cached_property
     def datetime(self) -> datetime:
         """
@@ -135,12 +135,20 @@ class ExtractionRecord(BaseCycleMetricRecord):
 
         Reference: https://github.com/nthmost/illuminate/blob/master/illuminate/extraction_metrics.py#L83C42-L83C53
         """
-        bitmask = sum([2**i for i in range(62)])
-        ns100intervals = self.datestamp & bitmask
-        microseconds = timedelta(microseconds=ns100intervals / 10)
+        ns100intervals = self.datestamp & _DATESTAMP_MASK
+        microseconds = timedelta(microseconds=ns100intervals // 10)
         datetime_of_record = datetime(1, 1, 1) + microseconds
         return datetime_of_record
 
+    @classmethod
+    def derived_columns(
+        cls, records: npt.NDArray[np.void]
+    ) -> dict[str, npt.NDArray[Any]]:
+        """The `datetime` of every record, converted in one pass."""
+        ns100intervals = records["datestamp"] & np.uint64(_DATESTAMP_MASK)
+        microseconds = (ns100intervals // np.uint64(10)).astype("timedelta64[us]")
+        return {"datetime": np.datetime64("0001-01-01", "us") + microseconds}
+
 
 class ImageRecord(BaseCycleMetricRecord):
     """
@@ -217,6 +225,10 @@ class ErrorRecord(BaseCycleMetricRecord):
     num_4_errors: uint32
 
 
+# Column names of the quality bins once a QualityRecord is flattened.
+QUALITY_BIN_FIELDS = tuple(f"q{k:02}" for k in range(1, 51))
+
+
 def check_quality_record_length(v: Sequence[int]) -> Sequence[int]:
     assert len(v) == 50, "Length mismatch!"
     return v
@@ -240,7 +252,7 @@ class QualityRecord(BaseCycleMetricRecord):
             "lane": self.lane,
             "tile": self.tile,
             "cycle": self.cycle,
-            **{f"q{k:02}": v for k, v in enumerate(self.quality_bins, start=1)},
+            **dict(zip(QUALITY_BIN_FIELDS, self.quality_bins)),
         }
 
 
@@ -1,9 +1,16 @@
+import mmap
 from enum import Enum
+from functools import cache
 from io import BufferedReader
-from struct import unpack
-from typing import Any, Iterator
+from struct import Struct
+from typing import Iterator
+
+import numpy as np
+import numpy.typing as npt
 
 from .models import (
+    QUALITY_BIN_FIELDS,
+    BaseRecord,
     CollapsedQRecord,
     CorrectedIntensityRecord,
     ErrorRecord,
@@ -15,23 +22,178 @@ from .models import (
     TileMetricRecord,
 )
 
+# struct format characters and their little-endian numpy equivalents
+_NUMPY_TYPES = {"H": "<u2", "I": "<u4", "L": "<u4", "Q": "<u8", "f": "<f4"}
+
 
 class BinaryFormat(Enum):
     HEADER = ("!BB", None, None)
-    ERROR = ("<HHHfLLLLL", 30, 3)
-    TILE = ("<HHHf", 10, 2)
-    QUALITY = ("<HHH" + "L" * 50, 206, 4)
-    CORRECTEDINTENSITY = ("<HHH" + "H" * 9 + "I" * 5 + "f", 48, 2)
-    EXTRACTION = ("<HHHffffHHHHQ", 38, 2)
-    IMAGE = ("<HHHHHH", 12, 1)
-    PHASING = ("<HHHff", 14, 1)
+    ERROR = (
+        "<HHHfLLLLL",
+        30,
+        3,
+        (
+            "lane",
+            "tile",
+            "cycle",
+            "error_rate",
+            "num_0_errors",
+            "num_1_errors",
+            "num_2_errors",
+            "num_3_errors",
+            "num_4_errors",
+        ),
+    )
+    TILE = ("<HHHf", 10, 2, ("lane", "tile", "metric_code", "metric_value"))
+    QUALITY = (
+        "<HHH" + "L" * 50,
+        206,
+        4,
+        ("lane", "tile", "cycle") + QUALITY_BIN_FIELDS,
+    )
+    CORRECTEDINTENSITY = (
+        "<HHH" + "H" * 9 + "I" * 5 + "f",
+        48,
+        2,
+        (
+            "lane",
+            "tile",
+            "cycle",
+            "avg_cycle_intensity",
+            "avg_corrected_intensity_a",
+            "avg_corrected_intensity_c",
+            "avg_corrected_intensity_g",
+            "avg_corrected_intensity_t",
+            "avg_corrected_cluster_intensity_a",
+            "avg_corrected_cluster_intensity_c",
+            "avg_corrected_cluster_intensity_g",
+            "avg_corrected_cluster_intensity_t",
+            "num_base_calls_none",
+            "num_base_calls_a",
+            "num_base_calls_c",
+            "num_base_calls_g",
+            "num_base_calls_t",
+            "snr",
+        ),
+    )
+    EXTRACTION = (
+        "<HHHffffHHHHQ",
+        38,
+        2,
+        (
+            "lane",
+            "tile",
+            "cycle",
+            "focus_a",
+            "focus_c",
+            "focus_g",
+            "focus_t",
+            "max_intensity_a",
+            "max_intensity_c",
+            "max_intensity_g",
+            "max_intensity_t",
+            "datestamp",
+        ),
+    )
+    IMAGE = (
+        "<HHHHHH",
+        12,
+        1,
+        ("lane", "tile", "cycle", "channel_number", "min_contrast", "max_contrast"),
+    )
+    PHASING = (
+        "<HHHff",
+        14,
+        1,
+        ("lane", "tile", "cycle", "phasing_weight", "prephasing_weight"),
+    )
     SUMMARY = ("<Hffff", None, None)
-    COLLAPSEDQ = ("<HHHIIII", 22, 2)
-
-    def __init__(self, format: str, length: int, min_version: int):
+    COLLAPSEDQ = (
+        "<HHHIIII",
+        22,
+        2,
+        ("lane", "tile", "cycle", "q20", "q30", "total_count", "median_score"),
+    )
+
+    def __init__(
+        self,
+        format: str,
+        length: int,
+        min_version: int,
+        fields: tuple[str, ...] | None = None,
+    ):
         self.format = format
         self.length = length
         self.min_version = min_version
+        self.fields = fields
+
+    def record_dtype(self, record_length: int | None = None) -> np.dtype[np.void]:
+        """Build a numpy structured dtype matching one record of this format.
+
+        Field names match the keys of the record model's `model_dump()`.
+
+        :param int record_length: the record length from the file header. Some
+        versions pad records past the values we decode, so the dtype is widened
+        to this many bytes. Defaults to the length of the decoded values.
+        """
+        if self.fields is None:
+            raise ValueError(f"{self.name} has no fixed record layout.")
+        dtype = np.dtype(
+            [
+                (name, _NUMPY_TYPES[code])
+                for name, code in zip(self.fields, self.format[1:])
+            ]
+        )
+        if record_length is None or record_length == dtype.itemsize:
+            return dtype
+        if record_length < dtype.itemsize:
+            raise ValueError(
+                "Record length {} is shorter than the {} bytes of a {} record.".format(
+                    record_length, dtype.itemsize, self.name
+                )
+            )
+        assert dtype.fields is not None
+        return np.dtype(
+            {
+                "names": list(self.fields),
+                "formats": [dtype.fields[name][0] for name in self.fields],
+                "offsets": [dtype.fields[name][1] for name in self.fields],
+                "itemsize": record_length,
+            }
+        )
+
+
+# Number of records fetched per read() call by read_records.
+RECORDS_PER_BLOCK = 4096
+
+# Layouts unpacked by hand, compiled once rather than on every call.
+_HEADER = Struct(BinaryFormat.HEADER.format)
+_INDEX_VERSION = Struct("<B")
+_INDEX_KEY = Struct("<HHH")
+_INDEX_CLUSTER_COUNT_V1 = Struct("<I")
+_INDEX_CLUSTER_COUNT = Struct("<Q")
+_INDEX_NAME_LENGTH = Struct("<H")
+
+
+def _file_name(data_file: BufferedReader) -> str:
+    """Name a file in error messages; in-memory streams have no name."""
+    return str(getattr(data_file, "name", repr(data_file)))
+
+
+def _read_header(data_file: BufferedReader, min_version: int) -> int:
+    """Read the two-byte header of an Interop file and check its version.
+
+    :return: the length of each record in the file.
+    """
+    header = data_file.read(2)
+    version, record_length = _HEADER.unpack(header)
+    if version < min_version:
+        raise ValueError(
+            "File version {} is less than minimum version {} in {}.".format(
+                version, min_version, _file_name(data_file)
+            )
+        )
+    return int(record_length)
 
 
 def read_records(
@@ -44,27 +206,104 @@ def read_records(
     :param int min_version: the minimum accepted file version.
     :return: an iterator over the records in the file. Each record will be a raw
     byte string of the length from the header.
+
+    The readers in this module decode fixed-width files with
+    `read_records_array` instead; this is kept for callers that want the raw
+    records.
     """
-    header = data_file.read(2)
-    version, record_length = unpack(BinaryFormat.HEADER.format, header)
-    if version < min_version:
-        raise ValueError(
-            "File version {} is less than minimum version {} in {}.".format(
-                version, min_version, data_file.name
-            )
-        )
+    record_length = _read_header(data_file, min_version)
+    # One buffer is filled in place for every block; only the yielded records
+    # are copied out of it.
+    buffer = bytearray(record_length * RECORDS_PER_BLOCK)
+    view = memoryview(buffer)
+    filled = 0
     while True:
-        data = data_file.read(record_length)
-        read_length = len(data)
-        if read_length == 0:
+        read_length = data_file.readinto(view[filled:])
+        if not read_length:
             break
-        if read_length < record_length:
-            raise RuntimeError(
-                "Partial record of length {} found in {}.".format(
-                    read_length, data_file.name
-                )
+        filled += read_length
+        end = filled - filled % record_length
+        for start in range(0, end, record_length):
+            yield bytes(view[start : start + record_length]), record_length
+        # Move an incomplete trailing record to the front for the next read.
+        view[: filled - end] = view[end:filled]
+        filled -= end
+    if filled:
+        raise RuntimeError(
+            "Partial record of length {} found in {}.".format(filled, _file_name(data_file))
+        )
+
+
+def _check_whole_records(
+    data_file: BufferedReader, body_length: int, record_length: int
+) -> None:
+    partial_length = body_length % record_length
+    if partial_length:
+        raise RuntimeError(
+            "Partial record of length {} found in {}.".format(
+                partial_length, _file_name(data_file)
             )
-        yield data, record_length
+        )
+
+
+def read_records_array(
+    data_file: BufferedReader, binary_format: BinaryFormat
+) -> npt.NDArray[np.void]:
+    """Read all records from a fixed-width Illumina Interop file at once.
+
+    :param file data_file: an open file-like object. Needs to have a two-byte
+    header with the file version and the length of each record, followed by the
+    records.
+    :param BinaryFormat binary_format: the layout of each record.
+    :return: a numpy structured array with one element per record, see
+    `BinaryFormat.record_dtype` for the fields.
+    """
+    record_length = _read_header(data_file, binary_format.min_version)
+    dtype = binary_format.record_dtype(record_length)
+    offset = data_file.tell()
+    data: bytes | mmap.mmap
+    try:
+        # Map the file rather than copying it into a bytes object; the
+        # returned array keeps the mapping open for as long as it is in use.
+        data = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        data = data_file.read()
+        offset = 0
+    else:
+        data_file.seek(0, 2)
+    _check_whole_records(data_file, len(data) - offset, record_length)
+    return np.frombuffer(data, dtype=dtype, offset=offset)
+
+
+def count_records(data_file: BufferedReader, binary_format: BinaryFormat) -> int:
+    """Count the records in a fixed-width Illumina Interop file from its header
+    and size, without reading them.
+
+    :param file data_file: an open file-like object, as for `read_records_array`.
+    :param BinaryFormat binary_format: the layout of each record.
+    :return: the number of records. Raises the same errors as
+    `read_records_array` for a bad header or a partial record.
+    """
+    record_length = _read_header(data_file, binary_format.min_version)
+    binary_format.record_dtype(record_length)
+    offset = data_file.tell()
+    body_length = data_file.seek(0, 2) - offset
+    _check_whole_records(data_file, body_length, record_length)
+    return body_length // record_length
+
+
+# The readers below build records with `model_construct`, skipping pydantic
+# validation. Every value is decoded from a fixed-width binary field, so it is
+# already the right type and range; validating each field of every record was
+# the dominant cost of reading a file.
+#
+# Every record sets all of its fields, so records of one model share a single
+# fields-set rather than each carrying its own copy.
+
+
+@cache
+def _all_fields(model: type[BaseRecord]) -> set[str]:
+    return set(model.model_fields)
 
 
 def read_errors(data_file: BufferedReader) -> Iterator[ErrorRecord]:
@@ -85,9 +324,10 @@ def read_errors(data_file: BufferedReader) -> Iterator[ErrorRecord]:
     - num_3_errors [uint32]
     - num_4_errors [uint32]
     """
-    for data, _ in read_records(data_file, min_version=BinaryFormat.ERROR.min_version):
-        fields = unpack(BinaryFormat.ERROR.format, data[: BinaryFormat.ERROR.length])
-        yield ErrorRecord(
+    fields_set = _all_fields(ErrorRecord)
+    for fields in read_records_array(data_file, BinaryFormat.ERROR).tolist():
+        yield ErrorRecord.model_construct(
+            _fields_set=fields_set,
             lane=fields[0],
             tile=fields[1],
             cycle=fields[2],
@@ -113,9 +353,10 @@ def read_tiles(data_file: BufferedReader) -> Iterator[TileMetricRecord]:
     - metric_code [uint16]
     - metric_value [float32]
     """
-    for data, _ in read_records(data_file, min_version=BinaryFormat.TILE.min_version):
-        fields = unpack(BinaryFormat.TILE.format, data[: BinaryFormat.TILE.length])
-        yield TileMetricRecord(
+    fields_set = _all_fields(TileMetricRecord)
+    for fields in read_records_array(data_file, BinaryFormat.TILE).tolist():
+        yield TileMetricRecord.model_construct(
+            _fields_set=fields_set,
             lane=fields[0],
             tile=fields[1],
             metric_code=fields[2],
@@ -138,9 +379,10 @@ def read_images(data_file: BufferedReader) -> Iterator[ImageRecord]:
     - minimum_contrast [uint16]
     - maximum_contrast [uint16]
     """
-    for data, _ in read_records(data_file, min_version=BinaryFormat.IMAGE.min_version):
-        fields = unpack(BinaryFormat.IMAGE.format, data[: BinaryFormat.IMAGE.length])
-        yield ImageRecord(
+    fields_set = _all_fields(ImageRecord)
+    for fields in read_records_array(data_file, BinaryFormat.IMAGE).tolist():
+        yield ImageRecord.model_construct(
+            _fields_set=fields_set,
             lane=fields[0],
             tile=fields[1],
             cycle=fields[2],
@@ -164,9 +406,10 @@ def read_phasing(data_file: BufferedReader) -> Iterator[PhasingRecord]:
     - phasing_weight [float32]
     - prephasing weight [float32]
     """
-    for data, _ in read_records(data_file, min_version=BinaryFormat.PHASING.min_version):
-        fields = unpack(BinaryFormat.PHASING.format, data[: BinaryFormat.PHASING.length])
-        yield PhasingRecord(
+    fields_set = _all_fields(PhasingRecord)
+    for fields in read_records_array(data_file, BinaryFormat.PHASING).tolist():
+        yield PhasingRecord.model_construct(
+            _fields_set=fields_set,
             lane=fields[0],
             tile=fields[1],
             cycle=fields[2],
@@ -188,13 +431,10 @@ def read_quality(data_file: BufferedReader) -> Iterator[QualityRecord]:
     - cycle [uint16]
     - quality_bins [list of 50 uint32, representing quality 1 to 50]
     """
-    for data, _ in read_records(
-        data_file, min_version=BinaryFormat.QUALITY.min_version
-    ):
-        fields = unpack(
-            BinaryFormat.QUALITY.format, data[: BinaryFormat.QUALITY.length]
-        )
-        yield QualityRecord(
+    fields_set = _all_fields(QualityRecord)
+    for fields in read_records_array(data_file, BinaryFormat.QUALITY).tolist():
+        yield QualityRecord.model_construct(
+            _fields_set=fields_set,
             lane=fields[0],
             tile=fields[1],
             cycle=fields[2],
@@ -218,12 +458,10 @@ def read_collapsed_q_metric(data_file: BufferedReader) -> Iterator[CollapsedQRec
     - total_count [uint32]
     - median_score [uint32]
     """
-    # NOTE: this is the only one we need to dynamically check the record length for
-    for data, record_length in read_records(
-        data_file, min_version=BinaryFormat.COLLAPSEDQ.min_version
-    ):
-        fields = unpack(BinaryFormat.COLLAPSEDQ.format, data[:record_length])
-        yield CollapsedQRecord(
+    fields_set = _all_fields(CollapsedQRecord)
+    for fields in read_records_array(data_file, BinaryFormat.COLLAPSEDQ).tolist():
+        yield CollapsedQRecord.model_construct(
+            _fields_set=fields_set,
             lane=fields[0],
             tile=fields[1],
             cycle=fields[2],
@@ -263,14 +501,11 @@ def read_corrected_intensities(
     - average number of base calls for base T [uint32]
     - signal to noise ratio [float32]
     """
-    for data, _ in read_records(
-        data_file, min_version=BinaryFormat.CORRECTEDINTENSITY.min_version
-    ):
-        fields = unpack(
-            BinaryFormat.CORRECTEDINTENSITY.format,
-            data[: BinaryFormat.CORRECTEDINTENSITY.length],
-        )
-        yield CorrectedIntensityRecord(
+    records = read_records_array(data_file, BinaryFormat.CORRECTEDINTENSITY)
+    fields_set = _all_fields(CorrectedIntensityRecord)
+    for fields in records.tolist():
+        yield CorrectedIntensityRecord.model_construct(
+            _fields_set=fields_set,
             lane=fields[0],
             tile=fields[1],
             cycle=fields[2],
@@ -315,14 +550,10 @@ def read_extractions(
     - max intensity for channel T [uint16]
     - date time stamp [uint64]
     """
-    for data, _ in read_records(
-        data_file, min_version=BinaryFormat.EXTRACTION.min_version
-    ):
-        fields = unpack(
-            BinaryFormat.EXTRACTION.format,
-            data[: BinaryFormat.EXTRACTION.length],
-        )
-        yield ExtractionRecord(
+    fields_set = _all_fields(ExtractionRecord)
+    for fields in read_records_array(data_file, BinaryFormat.EXTRACTION).tolist():
+        yield ExtractionRecord.model_construct(
+            _fields_set=fields_set,
             lane=fields[0],
             tile=fields[1],
             cycle=fields[2],
@@ -352,53 +583,62 @@ def read_index(data_file: BufferedReader) -> Iterator[IndexRecord]:
     """
 
     header = data_file.read(1)
-    version = unpack("<B", header)[0]
+    version = _INDEX_VERSION.unpack(header)[0]
     if version < 1:
         raise ValueError(
             "File version {} is less than minimum version {} in {}.".format(
-                version, 1, data_file.name
+                version, 1, _file_name(data_file)
             )
         )
-    while True:
-        metric = data_file.read(6)
-        if len(metric) == 0:
-            break
-        elif len(metric) < 6:
+    if version == 1:
+        count_format = _INDEX_CLUSTER_COUNT_V1
+    else:
+        count_format = _INDEX_CLUSTER_COUNT
+    fields_set = _all_fields(IndexRecord)
+    # Read the whole file once and walk it with an offset, rather than making
+    # several small reads for every record.
+    view = memoryview(data_file.read())
+    end = len(view)
+    offset = 0
+
+    def read_name() -> tuple[int, bytes]:
+        nonlocal offset
+        if offset + _INDEX_NAME_LENGTH.size > end:
+            raise RuntimeError("Partial record for index file, breaking.")
+        (length,) = _INDEX_NAME_LENGTH.unpack_from(view, offset)
+        offset += _INDEX_NAME_LENGTH.size
+        if offset + length > end:
             raise RuntimeError("Partial record for index file, breaking.")
-        lane, tile, read = unpack("<HHH", metric)
+        name = view[offset : offset + length].tobytes()
+        offset += length
+        return length, name
 
-        data: dict[str, dict[str, Any]] = {}
+    while offset < end:
+        if offset + _INDEX_KEY.size > end:
+            raise RuntimeError("Partial record for index file, breaking.")
+        lane, tile, read = _INDEX_KEY.unpack_from(view, offset)
+        offset += _INDEX_KEY.size
 
         # unfortunately the cluster_count property is embedded in the middle of
         # these other difficult to read bytes.
-        cluster_count = -1
-        for name in ["index", None, "sample", "project"]:
-            if name is None:
-                if version == 1:
-                    index_cluster_count_bytes = data_file.read(4)
-                    cluster_count = unpack("I", index_cluster_count_bytes)[0]
-                else:
-                    index_cluster_count_bytes = data_file.read(8)
-                    print(index_cluster_count_bytes)
-                    cluster_count = unpack("Q", index_cluster_count_bytes)[0]
-            else:
-                data[name] = {}
-                data[name]["length_bytes"] = data_file.read(2)
-                data[name]["length"] = unpack("H", data[name]["length_bytes"])[0]
-                data[name]["name_bytes"] = data_file.read(data[name]["length"])
-                data[name]["name"] = unpack(
-                    f"{data[name]['length']}s", data[name]["name_bytes"]
-                )[0]
-
-        yield IndexRecord(
+        index_length, index_name = read_name()
+        if offset + count_format.size > end:
+            raise RuntimeError("Partial record for index file, breaking.")
+        (cluster_count,) = count_format.unpack_from(view, offset)
+        offset += count_format.size
+        sample_length, sample_name = read_name()
+        project_length, project_name = read_name()
+
+        yield IndexRecord.model_construct(
+            _fields_set=fields_set,
             lane_number=lane,
             tile_number=tile,
             read_number=read,
-            index_name_b=data["index"]["name"],
-            index_name_length=data["index"]["length"],
+            index_name_b=index_name,
+            index_name_length=index_length,
             index_cluster_count=cluster_count,
-            sample_name_b=data["sample"]["name"],
-            sample_name_length=data["sample"]["length"],
-            project_name_b=data["project"]["name"],
-            project_name_length=data["project"]["length"],
+            sample_name_b=sample_name,
+            sample_name_length=sample_length,
+            project_name_b=project_name,
+            project_name_length=project_length,
         )
@@ -1,13 +1,12 @@
-import string
+from argparse import Namespace
 from pathlib import Path
 from random import Random
-from struct import pack
+from typing import Any, Callable, Iterator
 
 import pytest
 
-from miseqinteropreader.read_records import BinaryFormat
-
 from .interoptestgenerator import (
+    SAMPLE_SHEET,
     CollapsedQRecordGenerator,
     CorrectedIntensityRecordGenerator,
     ErrorRecordGenerator,
@@ -19,6 +18,68 @@ from .interoptestgenerator import (
     TileRecordGenerator,
 )
 
+# xdist_group names for test classes, so that `pytest -n auto --dist=loadgroup`
+# keeps each family of CLI tests on one worker.
+XDIST_GROUPS = {
+    "TestCLIParser": "cli_parse",
+    "TestValidateCommand": "cli_exec",
+    "TestInfoCommand": "cli_exec",
+    "TestSummaryCommand": "cli_exec",
+    "TestExtractCommand": "cli_exec",
+}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--cached",
+        action="store_true",
+        help="reuse records parsed by the integration tests in earlier runs, "
+        "kept in the pytest cache",
+    )
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    for item in items:
+        cls = getattr(item, "cls", None)
+        if cls is not None and cls.__name__ in XDIST_GROUPS:
+            item.add_marker(pytest.mark.xdist_group(XDIST_GROUPS[cls.__name__]))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_color() -> Iterator[None]:
+    # argparse on Python 3.14+ probes the environment for colour support every
+    # time a parser is built; settle it once for the whole session.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("PYTHON_COLORS", "0")
+        mp.setenv("NO_COLOR", "1")
+        yield
+
+
+@pytest.fixture
+def args_factory() -> Callable[..., Callable[..., Namespace]]:
+    """Make builders of command arguments.
+
+    `args_factory(**defaults)` returns a function that builds a Namespace of a
+    command's `defaults`, with the verbosity flags off, updated by its own
+    keyword arguments.
+    """
+
+    def _args_factory(**defaults: Any) -> Callable[..., Namespace]:
+        def _make_args(**overrides: Any) -> Namespace:
+            return Namespace(
+                **{
+                    "quiet": False,
+                    "verbose": False,
+                    "debug": False,
+                    **defaults,
+                    **overrides,
+                }
+            )
+
+        return _make_args
+
+    return _args_factory
+
 
 @pytest.fixture
 def run_dir(tmp_path: Path) -> Path:
@@ -36,21 +97,26 @@ def run_dir(tmp_path: Path) -> Path:
     return run_dir
 
 @pytest.fixture
-def interop_dir(run_dir: Path) -> Path:
-    interop_dir = run_dir / "InterOp"
-    if not interop_dir.exists():
-        interop_dir.mkdir()
-    return interop_dir
+def prepared_run_dir(run_dir: Path) -> Path:
+    (run_dir / "SampleSheet.csv").write_bytes(SAMPLE_SHEET)
+    return run_dir
 
 @pytest.fixture
+def interop_dir(run_dir: Path) -> Path:
+    # run_dir has already created it
+    return run_dir / "InterOp"
+
+@pytest.fixture(scope="session")
 def rng() -> Random:
-    return Random()
+    # Seeded so the session-scoped rows below are reproducible; each row fixture
+    # is generated once per num_rows and shared by every test that reads it.
+    return Random(0)
 
-@pytest.fixture(params=[
+@pytest.fixture(scope="session", params=[
     pytest.param(1, id="1 row per file"),
     pytest.param(5, id="5 row per file"),
-    pytest.param(10, id="10 row per file"),
-    pytest.param(100, id="100 row per file"),
+    pytest.param(10, id="10 row per file", marks=pytest.mark.slow),
+    pytest.param(100, id="100 row per file", marks=pytest.mark.slow),
 ])
 def num_rows(request: pytest.FixtureRequest) -> int:
     return int(request.param)
@@ -61,29 +127,21 @@ def num_rows(request: pytest.FixtureRequest) -> int:
 def tile_metric_generator() -> TileRecordGenerator:
     return TileRecordGenerator()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def tile_metric_row(request: pytest.FixtureRequest, tile_metric_generator: TileRecordGenerator, rng: Random, num_rows: int) -> list[list[int | float]]:
-    return [tile_metric_generator.generate_row(rng) for _ in range(num_rows)]
+    return tile_metric_generator.generate_rows(rng, num_rows)
 
-@pytest.fixture
-def tile_metric_bytes(tile_metric_generator: TileRecordGenerator, tile_metric_row: list[list[int | float]]) -> list[bytes]:
-    return list(tile_metric_generator.generate_binary(tile_metric_row))
+@pytest.fixture(scope="session")
+def tile_metric_bytes(tile_metric_generator: TileRecordGenerator, tile_metric_row: list[list[int | float]]) -> bytes:
+    return tile_metric_generator.generate_binary_contiguous(tile_metric_row)
 
 @pytest.fixture
-def tile_metric_file(tile_metric_generator: TileRecordGenerator, interop_dir: Path, tile_metric_bytes: list[bytes]) -> Path:
-    file = interop_dir / "TileMetricsOut.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    tile_metric_generator.write_file(file, None, tile_metric_bytes)
-    return file
+def tile_metric_file(tile_metric_generator: TileRecordGenerator, interop_dir: Path, tile_metric_bytes: bytes) -> Path:
+    return tile_metric_generator.write_file(interop_dir / "TileMetricsOut.bin", None, tile_metric_bytes)
 
 @pytest.fixture
-def extended_tile_metric_file(tile_metric_generator: TileRecordGenerator, interop_dir: Path, tile_metric_bytes: list[bytes]) -> Path:
-    file = interop_dir / "ExtendedTileMetrics.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    tile_metric_generator.write_file(file, None, tile_metric_bytes)
-    return file
+def extended_tile_metric_file(tile_metric_generator: TileRecordGenerator, interop_dir: Path, tile_metric_bytes: bytes) -> Path:
+    return tile_metric_generator.write_file(interop_dir / "ExtendedTileMetrics.bin", None, tile_metric_bytes)
 
 # error metrics
 
@@ -91,21 +149,17 @@ def extended_tile_metric_file(tile_metric_generator: TileRecordGenerator, intero
 def error_metric_generator() -> ErrorRecordGenerator:
     return ErrorRecordGenerator()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def error_metric_row(request: pytest.FixtureRequest, error_metric_generator: ErrorRecordGenerator, rng: Random, num_rows: int) -> list[list[int | float]]:
-    return [error_metric_generator.generate_row(rng) for _ in range(num_rows)]
+    return error_metric_generator.generate_rows(rng, num_rows)
 
-@pytest.fixture
-def error_metric_bytes(error_metric_generator: ErrorRecordGenerator, error_metric_row: list[list[int | float]]) -> list[bytes]:
-    return list(error_metric_generator.generate_binary(error_metric_row))
+@pytest.fixture(scope="session")
+def error_metric_bytes(error_metric_generator: ErrorRecordGenerator, error_metric_row: list[list[int | float]]) -> bytes:
+    return error_metric_generator.generate_binary_contiguous(error_metric_row)
 
 @pytest.fixture
-def error_metric_file(error_metric_generator: ErrorRecordGenerator, interop_dir: Path, error_metric_bytes: list[bytes]) -> Path:
-    file = interop_dir / "ErrorMetricsOut.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    error_metric_generator.write_file(file, None, error_metric_bytes)
-    return file
+def error_metric_file(error_metric_generator: ErrorRecordGenerator, interop_dir: Path, error_metric_bytes: bytes) -> Path:
+    return error_metric_generator.write_file(interop_dir / "ErrorMetricsOut.bin", None, error_metric_bytes)
 
 # quality metrics
 
@@ -113,21 +167,17 @@ def error_metric_file(error_metric_generator: ErrorRecordGenerator, interop_dir:
 def quality_metric_generator() -> QualityRecordGenerator:
     return QualityRecordGenerator()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def quality_metric_row(request: pytest.FixtureRequest, quality_metric_generator: QualityRecordGenerator, rng: Random, num_rows: int) -> list[list[int | float]]:
-    return [quality_metric_generator.generate_row(rng) for _ in range(num_rows)]
+    return quality_metric_generator.generate_rows(rng, num_rows)
 
-@pytest.fixture
-def quality_metric_bytes(quality_metric_generator: QualityRecordGenerator, quality_metric_row: list[list[int | float]]) -> list[bytes]:
-    return list(quality_metric_generator.generate_binary(quality_metric_row))
+@pytest.fixture(scope="session")
+def quality_metric_bytes(quality_metric_generator: QualityRecordGenerator, quality_metric_row: list[list[int | float]]) -> bytes:
+    return quality_metric_generator.generate_binary_contiguous(quality_metric_row)
 
 @pytest.fixture
-def quality_metric_file(quality_metric_generator: QualityRecordGenerator, interop_dir: Path, quality_metric_bytes: list[bytes]) -> Path:
-    file = interop_dir / "QMetrics.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    quality_metric_generator.write_file(file, None, quality_metric_bytes)
-    return file
+def quality_metric_file(quality_metric_generator: QualityRecordGenerator, interop_dir: Path, quality_metric_bytes: bytes) -> Path:
+    return quality_metric_generator.write_file(interop_dir / "QMetrics.bin", None, quality_metric_bytes)
 
 # collapsed-q metrics
 
@@ -136,34 +186,30 @@ def collapsed_q_generator() -> CollapsedQRecordGenerator:
     return CollapsedQRecordGenerator()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def collapsed_q_metric_row(
     request: pytest.FixtureRequest,
     collapsed_q_generator: CollapsedQRecordGenerator,
     rng: Random, num_rows: int,
 ) -> list[list[int | float]]:
-    return [collapsed_q_generator.generate_row(rng) for _ in range(num_rows)]
+    return collapsed_q_generator.generate_rows(rng, num_rows)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def collapsed_q_metric_bytes(
     collapsed_q_generator: CollapsedQRecordGenerator,
     collapsed_q_metric_row: list[list[int | float]],
-) -> list[bytes]:
-    return list(collapsed_q_generator.generate_binary(collapsed_q_metric_row))
+) -> bytes:
+    return collapsed_q_generator.generate_binary_contiguous(collapsed_q_metric_row)
 
 
 @pytest.fixture
 def collapsed_q_metric_file(
     collapsed_q_generator: CollapsedQRecordGenerator,
     interop_dir: Path,
-    collapsed_q_metric_bytes: list[bytes],
+    collapsed_q_metric_bytes: bytes,
 ) -> Path:
-    file = interop_dir / "QMetrics2030.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    collapsed_q_generator.write_file(file, None, collapsed_q_metric_bytes)
-    return file
+    return collapsed_q_generator.write_file(interop_dir / "QMetrics2030.bin", None, collapsed_q_metric_bytes)
 
 # phasing metrics
 
@@ -172,34 +218,30 @@ def phasing_generator() -> PhasingRecordGenerator:
     return PhasingRecordGenerator()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def phasing_metric_row(
     request: pytest.FixtureRequest,
     phasing_generator: PhasingRecordGenerator,
     rng: Random, num_rows: int,
 ) -> list[list[int | float]]:
-    return [phasing_generator.generate_row(rng) for _ in range(num_rows)]
+    return phasing_generator.generate_rows(rng, num_rows)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def phasing_metric_bytes(
     phasing_generator: PhasingRecordGenerator,
     phasing_metric_row: list[list[int | float]],
-) -> list[bytes]:
-    return list(phasing_generator.generate_binary(phasing_metric_row))
+) -> bytes:
+    return phasing_generator.generate_binary_contiguous(phasing_metric_row)
 
 
 @pytest.fixture
 def phasing_metric_file(
     phasing_generator: PhasingRecordGenerator,
     interop_dir: Path,
-    phasing_metric_bytes: list[bytes],
+    phasing_metric_bytes: bytes,
 ) -> Path:
-    file = interop_dir / "EmpiricalPhasingMetrics.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    phasing_generator.write_file(file, None, phasing_metric_bytes)
-    return file
+    return phasing_generator.write_file(interop_dir / "EmpiricalPhasingMetrics.bin", None, phasing_metric_bytes)
 
 # index metrics
 
@@ -207,21 +249,17 @@ def phasing_metric_file(
 def index_metric_generator() -> IndexRecordGenerator:
     return IndexRecordGenerator()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def index_metric_row(request: pytest.FixtureRequest, index_metric_generator: IndexRecordGenerator, rng: Random, num_rows: int) -> list[list[int | bytes]]:
-    return [index_metric_generator.generate_row(rng) for _ in range(num_rows)]
+    return index_metric_generator.generate_rows(rng, num_rows)
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def index_metric_bytes(index_metric_generator: IndexRecordGenerator, index_metric_row: list[list[int | bytes]]) -> list[bytes]:
     return list(index_metric_generator.generate_binary(index_metric_row))
 
 @pytest.fixture
 def index_metric_file(index_metric_generator: IndexRecordGenerator, interop_dir: Path, index_metric_bytes: list[bytes]) -> Path:
-    file = interop_dir / "IndexMetrics.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    index_metric_generator.write_file(file, None, index_metric_bytes)
-    return file
+    return index_metric_generator.write_file(interop_dir / "IndexMetrics.bin", None, index_metric_bytes)
 
 # image metrics
 
@@ -229,21 +267,17 @@ def index_metric_file(index_metric_generator: IndexRecordGenerator, interop_dir:
 def image_metric_generator() -> ImageRecordGenerator:
     return ImageRecordGenerator()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def image_metric_row(request: pytest.FixtureRequest, image_metric_generator: ImageRecordGenerator, rng: Random, num_rows: int) -> list[list[int | bytes]]:
-    return [image_metric_generator.generate_row(rng) for _ in range(num_rows)]
+    return image_metric_generator.generate_rows(rng, num_rows)
 
-@pytest.fixture
-def image_metric_bytes(image_metric_generator: ImageRecordGenerator, image_metric_row: list[list[int | bytes]]) -> list[bytes]:
-    return list(image_metric_generator.generate_binary(image_metric_row))
+@pytest.fixture(scope="session")
+def image_metric_bytes(image_metric_generator: ImageRecordGenerator, image_metric_row: list[list[int | bytes]]) -> bytes:
+    return image_metric_generator.generate_binary_contiguous(image_metric_row)
 
 @pytest.fixture
-def image_metric_file(image_metric_generator: ImageRecordGenerator, interop_dir: Path, image_metric_bytes: list[bytes]) -> Path:
-    file = interop_dir / "ImageMetrics.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    image_metric_generator.write_file(file, None, image_metric_bytes)
-    return file
+def image_metric_file(image_metric_generator: ImageRecordGenerator, interop_dir: Path, image_metric_bytes: bytes) -> Path:
+    return image_metric_generator.write_file(interop_dir / "ImageMetrics.bin", None, image_metric_bytes)
 
 # corrected_intensity metrics
 
@@ -251,21 +285,17 @@ def image_metric_file(image_metric_generator: ImageRecordGenerator, interop_dir:
 def corrected_intensity_metric_generator() -> CorrectedIntensityRecordGenerator:
     return CorrectedIntensityRecordGenerator()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def corrected_intensity_metric_row(request: pytest.FixtureRequest, corrected_intensity_metric_generator: CorrectedIntensityRecordGenerator, rng: Random, num_rows: int) -> list[list[int | bytes]]:
-    return [corrected_intensity_metric_generator.generate_row(rng) for _ in range(num_rows)]
+    return corrected_intensity_metric_generator.generate_rows(rng, num_rows)
 
-@pytest.fixture
-def corrected_intensity_metric_bytes(corrected_intensity_metric_generator: CorrectedIntensityRecordGenerator, corrected_intensity_metric_row: list[list[int | bytes]]) -> list[bytes]:
-    return list(corrected_intensity_metric_generator.generate_binary(corrected_intensity_metric_row))
+@pytest.fixture(scope="session")
+def corrected_intensity_metric_bytes(corrected_intensity_metric_generator: CorrectedIntensityRecordGenerator, corrected_intensity_metric_row: list[list[int | bytes]]) -> bytes:
+    return corrected_intensity_metric_generator.generate_binary_contiguous(corrected_intensity_metric_row)
 
 @pytest.fixture
-def corrected_intensity_metric_file(corrected_intensity_metric_generator: CorrectedIntensityRecordGenerator, interop_dir: Path, corrected_intensity_metric_bytes: list[bytes]) -> Path:
-    file = interop_dir / "CorrectedIntMetrics.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    corrected_intensity_metric_generator.write_file(file, None, corrected_intensity_metric_bytes)
-    return file
+def corrected_intensity_metric_file(corrected_intensity_metric_generator: CorrectedIntensityRecordGenerator, interop_dir: Path, corrected_intensity_metric_bytes: bytes) -> Path:
+    return corrected_intensity_metric_generator.write_file(interop_dir / "CorrectedIntMetrics.bin", None, corrected_intensity_metric_bytes)
 
 # extraction metrics
 
@@ -273,18 +303,14 @@ def corrected_intensity_metric_file(corrected_intensity_metric_generator: Correc
 def extraction_metric_generator() -> ExtractionRecordGenerator:
     return ExtractionRecordGenerator()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def extraction_metric_row(request: pytest.FixtureRequest, extraction_metric_generator: ExtractionRecordGenerator, rng: Random, num_rows: int) -> list[list[int | bytes]]:
-    return [extraction_metric_generator.generate_row(rng) for _ in range(num_rows)]
+    return extraction_metric_generator.generate_rows(rng, num_rows)
 
-@pytest.fixture
-def extraction_metric_bytes(extraction_metric_generator: ExtractionRecordGenerator, extraction_metric_row: list[list[int | bytes]]) -> list[bytes]:
-    return list(extraction_metric_generator.generate_binary(extraction_metric_row))
+@pytest.fixture(scope="session")
+def extraction_metric_bytes(extraction_metric_generator: ExtractionRecordGenerator, extraction_metric_row: list[list[int | bytes]]) -> bytes:
+    return extraction_metric_generator.generate_binary_contiguous(extraction_metric_row)
 
 @pytest.fixture
-def extraction_metric_file(extraction_metric_generator: ExtractionRecordGenerator, interop_dir: Path, extraction_metric_bytes: list[bytes]) -> Path:
-    file = interop_dir / "ExtractionMetrics.bin"
-    if not file.parent.exists():
-        file.parent.mkdir(parents=True)
-    extraction_metric_generator.write_file(file, None, extraction_metric_bytes)
-    return file
+def extraction_metric_file(extraction_metric_generator: ExtractionRecordGenerator, interop_dir: Path, extraction_metric_bytes: bytes) -> Path:
+    return extraction_metric_generator.write_file(interop_dir / "ExtractionMetrics.bin", None, extraction_metric_bytes)
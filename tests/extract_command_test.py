@@ -1,51 +1,64 @@
 """Tests for extract command edge cases and additional formats."""
 
 import argparse
+import csv
 import json
 from pathlib import Path
+from typing import Callable
 
-import pandas as pd
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import pytest
 
+from miseqinteropreader import InterOpReader, MetricFile
 from miseqinteropreader.commands import extract
+from miseqinteropreader.models import ExtractionRecord
+
+
+@pytest.fixture
+def extract_args(
+    args_factory: Callable[..., Callable[..., argparse.Namespace]],
+    prepared_run_dir: Path,
+) -> Callable[..., argparse.Namespace]:
+    """Build extract arguments for prepared_run_dir, with the options off."""
+    return args_factory(
+        run_dir=prepared_run_dir,
+        metrics=None,
+        all=False,
+        format="json",
+        output=None,
+    )
 
 
 class TestExtractParquetFormat:
     """Tests for parquet format extraction."""
 
     def test_extract_single_metric_parquet(
-        self, run_dir, tile_metric_file, tmp_path, capsys
+        self, extract_args, tile_metric_file, tmp_path, capsys
     ):
         """Test extracting a single metric in parquet format."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         output_file = tmp_path / "tile_metrics.parquet"
-        args = argparse.Namespace(
-            run_dir=run_dir,
+        args = extract_args(
             metrics=["TILE_METRICS"],
-            all=False,
             format="parquet",
             output=output_file,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = extract.execute(args)
         assert result == 0
         assert output_file.exists()
 
-        # Verify parquet file
-        df = pd.read_parquet(output_file)
-        assert len(df) > 0
-        assert "lane" in df.columns
-        assert "tile" in df.columns
+        # Verify parquet file, from its footer
+        parquet_file = pq.ParquetFile(output_file)
+        assert parquet_file.metadata.num_rows > 0
+        assert "lane" in parquet_file.schema_arrow.names
+        assert "tile" in parquet_file.schema_arrow.names
+        column = parquet_file.metadata.row_group(0).column(0)
+        assert column.compression == "SNAPPY"
 
     def test_extract_multiple_metrics_parquet(
         self,
-        run_dir,
+        extract_args,
         tile_metric_file,
         error_metric_file,
         quality_metric_file,
@@ -53,21 +66,11 @@ class TestExtractParquetFormat:
         capsys,
     ):
         """Test extracting multiple metrics in parquet format to a directory."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         output_dir = tmp_path / "parquet_output"
-        args = argparse.Namespace(
-            run_dir=run_dir,
+        args = extract_args(
             metrics=["TILE_METRICS", "ERROR_METRICS"],
-            all=False,
             format="parquet",
             output=output_dir,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = extract.execute(args)
@@ -80,34 +83,75 @@ class TestExtractParquetFormat:
         assert error_file.exists()
 
         # Verify parquet files
-        tile_df = pd.read_parquet(tile_file)
-        error_df = pd.read_parquet(error_file)
-        assert len(tile_df) > 0
-        assert len(error_df) > 0
+        assert pq.ParquetFile(tile_file).metadata.num_rows > 0
+        assert pq.ParquetFile(error_file).metadata.num_rows > 0
+
+
+class TestExtractFeatherFormat:
+    """Tests for feather format extraction."""
+
+    def test_extract_single_metric_feather(
+        self, prepared_run_dir, extract_args, tile_metric_file, tmp_path
+    ):
+        """Test extracting a single metric in feather format."""
+        output_file = tmp_path / "tile_metrics.feather"
+        args = extract_args(metrics=["TILE_METRICS"], format=None, output=output_file)
+
+        result = extract.execute(args)
+        assert result == 0
+
+        table = feather.read_table(output_file)
+        expected = InterOpReader(prepared_run_dir).read_file_to_table(
+            MetricFile.TILE_METRICS
+        )
+        assert table.equals(expected)
+
+    def test_extract_multiple_metrics_feather(
+        self, extract_args, tile_metric_file, error_metric_file, tmp_path
+    ):
+        """Test extracting multiple metrics in feather format to a directory."""
+        output_dir = tmp_path / "feather_output"
+        args = extract_args(
+            metrics=["TILE_METRICS", "ERROR_METRICS"],
+            format="feather",
+            output=output_dir,
+        )
+
+        result = extract.execute(args)
+        assert result == 0
+
+        assert feather.read_table(output_dir / "tile_metrics.feather").num_rows > 0
+        assert feather.read_table(output_dir / "error_metrics.feather").num_rows > 0
+
+
+@pytest.mark.parametrize(
+    "output, expected",
+    [
+        (None, "json"),
+        (Path("out.json"), "json"),
+        (Path("out.CSV"), "csv"),
+        (Path("out.parquet"), "parquet"),
+        (Path("out.feather"), "feather"),
+        (Path("metrics"), "parquet"),
+        (Path("out.txt"), "parquet"),
+    ],
+)
+def test_default_format(output: Path | None, expected: str):
+    assert extract.default_format(output) == expected
 
 
 class TestExtractMultipleMetrics:
     """Tests for extracting multiple metrics to files/directories."""
 
     def test_extract_multiple_metrics_csv_to_directory(
-        self, run_dir, tile_metric_file, error_metric_file, tmp_path, capsys
+        self, extract_args, tile_metric_file, error_metric_file, tmp_path, capsys
     ):
         """Test extracting multiple metrics in CSV format to a directory."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         output_dir = tmp_path / "csv_output"
-        args = argparse.Namespace(
-            run_dir=run_dir,
+        args = extract_args(
             metrics=["TILE_METRICS", "ERROR_METRICS"],
-            all=False,
             format="csv",
             output=output_dir,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = extract.execute(args)
@@ -124,25 +168,31 @@ class TestExtractMultipleMetrics:
         assert "lane" in tile_content
         assert "tile" in tile_content
 
+    def test_extract_csv_columns(
+        self, extract_args, extraction_metric_file, extraction_metric_row, tmp_path
+    ):
+        """CSV columns are the model fields, with one row per record."""
+        output_file = tmp_path / "extraction.csv"
+        args = extract_args(
+            metrics=["EXTRACTION_METRICS"], format="csv", output=output_file
+        )
+
+        result = extract.execute(args)
+        assert result == 0
+
+        with output_file.open(newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == list(ExtractionRecord.model_fields)
+        assert len(rows) == len(extraction_metric_row) + 1
+
     def test_extract_multiple_metrics_json_to_directory(
-        self, run_dir, tile_metric_file, error_metric_file, tmp_path, capsys
+        self, extract_args, tile_metric_file, error_metric_file, tmp_path, capsys
     ):
         """Test extracting multiple metrics in JSON format to a directory."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         output_dir = tmp_path / "json_output"
-        args = argparse.Namespace(
-            run_dir=run_dir,
+        args = extract_args(
             metrics=["TILE_METRICS", "ERROR_METRICS"],
-            all=False,
-            format="json",
             output=output_dir,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = extract.execute(args)
@@ -161,24 +211,10 @@ class TestExtractMultipleMetrics:
         assert len(tile_data["records"]) > 0
 
     def test_extract_multiple_metrics_without_output_requires_output(
-        self, run_dir, tile_metric_file, error_metric_file, capsys
+        self, extract_args, tile_metric_file, error_metric_file, capsys
     ):
         """Test that extracting multiple metrics without output path fails."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            metrics=["TILE_METRICS", "ERROR_METRICS"],
-            all=False,
-            format="json",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = extract_args(metrics=["TILE_METRICS", "ERROR_METRICS"])
 
         result = extract.execute(args)
         assert result == 1
@@ -187,13 +223,9 @@ class TestExtractMultipleMetrics:
         assert "Output path required" in captured.err
 
     def test_extract_all_with_empty_records_skips_file(
-        self, run_dir, tmp_path, capsys, monkeypatch
+        self, run_dir, extract_args, tmp_path, capsys
     ):
         """Test that metrics with no records are skipped."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         # Create an empty TileMetricsOut.bin file (header only, no records)
         interop_dir = run_dir / "InterOp"
         tile_file = interop_dir / "TileMetricsOut.bin"
@@ -203,44 +235,40 @@ class TestExtractMultipleMetrics:
             f.write(b"\x0a")  # Record size
 
         output_dir = tmp_path / "output"
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            metrics=None,
-            all=True,
-            format="json",
-            output=output_dir,
-            verbosity=2,  # Verbose to see skip messages
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = extract_args(all=True, output=output_dir)
 
         result = extract.execute(args)
         # Should succeed but not create files for empty metrics
         assert result == 0
 
+    def test_extract_truncated_file_fails(
+        self, run_dir, extract_args, tmp_path, capsys
+    ):
+        """Test that a file with a partial record is an error, not skipped."""
+        tile_file = run_dir / "InterOp" / "TileMetricsOut.bin"
+        # A valid header and less than one 10-byte record
+        tile_file.write_bytes(b"\x02\x0a\x01\x00")
+
+        args = extract_args(metrics=["TILE_METRICS"], output=tmp_path / "out.json")
+
+        result = extract.execute(args)
+        assert result == 1
+
+        captured = capsys.readouterr()
+        assert "Partial record" in captured.err
+
 
 class TestExtractEdgeCases:
     """Tests for edge cases in extract command."""
 
     def test_extract_metric_not_found_with_all_flag_skips(
-        self, run_dir, tile_metric_file, tmp_path, capsys
+        self, extract_args, tile_metric_file, tmp_path, capsys
     ):
         """Test that --all flag skips metrics that aren't found."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         output_file = tmp_path / "output.json"
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            metrics=None,
+        args = extract_args(
             all=True,
-            format="json",
             output=output_file,
-            verbosity=2,  # Verbose mode
-            quiet=False,
-            debug=False,
             verbose=True,  # Enable verbose to see skipping messages
         )
 
@@ -252,24 +280,13 @@ class TestExtractEdgeCases:
         assert "Skipping" in captured.err or "not found" in captured.err.lower()
 
     def test_extract_specified_metric_not_found_fails(
-        self, run_dir, tmp_path, capsys
+        self, extract_args, tmp_path, capsys
     ):
         """Test that specifying a missing metric returns error."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         output_file = tmp_path / "output.json"
-        args = argparse.Namespace(
-            run_dir=run_dir,
+        args = extract_args(
             metrics=["QUALITY_METRICS"],  # File doesn't exist
-            all=False,
-            format="json",
             output=output_file,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = extract.execute(args)
@@ -278,27 +295,42 @@ class TestExtractEdgeCases:
         captured = capsys.readouterr()
         assert "not found" in captured.err
 
-    def test_extract_no_metrics_to_extract_fails(self, run_dir, tmp_path, capsys):
+    def test_extract_no_metrics_to_extract_fails(self, extract_args, tmp_path, capsys):
         """Test that having no metrics to extract returns error."""
-        # Create SampleSheet.csv but no metric files
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
+        # No metric files
         output_file = tmp_path / "output.json"
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            metrics=None,
-            all=True,
-            format="json",
-            output=output_file,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = extract_args(all=True, output=output_file)
 
         result = extract.execute(args)
         assert result == 1
 
         captured = capsys.readouterr()
         assert "No metrics to extract" in captured.err
+
+
+class TestDumpRecords:
+    """Tests for converting records to dicts."""
+
+    def test_dump_records_matches_model_dump(
+        self, prepared_run_dir, quality_metric_file, extraction_metric_file
+    ):
+        """Test that bulk conversion gives the same dicts as model_dump."""
+        reader = InterOpReader(prepared_run_dir)
+
+        for metric in (MetricFile.QUALITY_METRICS, MetricFile.EXTRACTION_METRICS):
+            records = reader.read_generic_records(metric)
+            expected = [record.model_dump() for record in records]
+            assert extract.dump_records(records) == expected
+
+    def test_iter_dumped_records_chunks(self, prepared_run_dir, phasing_metric_file):
+        """Test that chunked conversion gives the same dicts in order."""
+        reader = InterOpReader(prepared_run_dir)
+
+        records = reader.read_generic_records(MetricFile.PHASING_METRICS)
+        dumped = list(extract.iter_dumped_records(records, chunk_size=3))
+
+        assert dumped == extract.dump_records(records)
+
+    def test_dump_records_empty(self):
+        """Test that no records gives no dicts."""
+        assert extract.dump_records([]) == []
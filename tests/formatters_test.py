@@ -1,6 +1,7 @@
 """Tests for formatter modules."""
 
 import json
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
@@ -163,6 +164,93 @@ class TestJSONFormatter:
         assert output_file.exists()
         assert output_file.parent.exists()
 
+    def test_dumps_matches_stdlib_layout(self, monkeypatch):
+        """Test that orjson and the stdlib fallback give the same output."""
+        from miseqinteropreader.formatters import json_formatter
+
+        data = {
+            "run": "test_run",
+            "created": datetime(2024, 1, 2, 3, 4, 5),
+            "counts": {1: 10, 2: 20},
+            "rates": [0.95, 0.001, 3],
+            "empty": [],
+        }
+
+        fast = json_formatter.dumps(data)
+        monkeypatch.setattr(json_formatter, "HAS_ORJSON", False)
+        fallback = json_formatter.dumps(data)
+
+        assert fast == fallback
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_dumps_non_finite_floats(self, tmp_path, monkeypatch, has_orjson):
+        """Test that NaN and infinities are written the same way on both paths."""
+        from miseqinteropreader.formatters import json_formatter
+
+        monkeypatch.setattr(
+            json_formatter, "HAS_ORJSON", has_orjson and json_formatter.HAS_ORJSON
+        )
+        record: dict[str, Any] = {
+            "lane": 1,
+            "error_rate": float("nan"),
+            "rates": [float("inf"), -1.5],
+        }
+
+        assert json_formatter.dumps(record) == json.dumps(record, indent=2).encode()
+
+        header = {"metric": "ERROR_METRICS"}
+        records: list[dict[str, Any]] = [{"lane": 1, "error_rate": 0.5}, record]
+        output_file = tmp_path / "output.json"
+        json_formatter.format_records_stream(header, records, output_file)
+        expected = {**header, "records": records, "record_count": 2}
+        assert output_file.read_bytes() == json.dumps(expected, indent=2).encode()
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_format_records_stream(self, tmp_path, monkeypatch, has_orjson):
+        """Test that streamed records match dumps() of the whole object."""
+        from miseqinteropreader.formatters import json_formatter
+
+        monkeypatch.setattr(
+            json_formatter, "HAS_ORJSON", has_orjson and json_formatter.HAS_ORJSON
+        )
+        header = {"run_name": "test_run", "metric": "TILE_METRICS"}
+        records: list[dict[str, Any]] = [
+            {"lane": 1, "note": "a\nb", "values": [1, 2]},
+            {"lane": 2},
+        ]
+        output_file = tmp_path / "output.json"
+
+        count = json_formatter.format_records_stream(
+            header, iter(records), output_file
+        )
+
+        assert count == 2
+        expected = {**header, "records": records, "record_count": 2}
+        assert output_file.read_bytes() == json_formatter.dumps(expected)
+
+    def test_format_records_stream_to_stdout(self, capsys):
+        """Test streaming records to stdout."""
+        from miseqinteropreader.formatters.json_formatter import format_records_stream
+
+        count = format_records_stream({"metric": "TILE_METRICS"}, [{"lane": 1}])
+
+        captured = capsys.readouterr()
+        assert count == 1
+        assert json.loads(captured.out) == {
+            "metric": "TILE_METRICS",
+            "records": [{"lane": 1}],
+            "record_count": 1,
+        }
+
+    def test_format_records_stream_empty(self, tmp_path):
+        """Test that no file is written when there are no records."""
+        from miseqinteropreader.formatters.json_formatter import format_records_stream
+
+        output_file = tmp_path / "output.json"
+
+        assert format_records_stream({"metric": "TILE_METRICS"}, [], output_file) == 0
+        assert not output_file.exists()
+
 
 class TestCSVFormatter:
     """Test the CSV formatter."""
@@ -188,6 +276,20 @@ class TestCSVFormatter:
         assert "1101" in content
         assert "1102" in content
 
+    def test_format_generator(self, tmp_path):
+        """Test streaming rows from a generator and counting them."""
+        from miseqinteropreader.formatters.csv_formatter import format_output
+
+        data = ({"tile": 1101, "cycle": cycle} for cycle in range(1, 6))
+        output_file = tmp_path / "output.csv"
+
+        count = format_output(data, output_file)
+
+        assert count == 5
+        lines = output_file.read_text().splitlines()
+        assert lines[0] == "tile,cycle"
+        assert lines[1:] == [f"1101,{cycle}" for cycle in range(1, 6)]
+
     def test_format_to_stdout(self, capsys):
         """Test formatting CSV to stdout."""
         from miseqinteropreader.formatters.csv_formatter import format_output
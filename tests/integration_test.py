@@ -1,12 +1,24 @@
 import os
+import pickle
 import re
 from pathlib import Path
 from random import Random
+from typing import Callable, Sequence, TypeVar
 
 import pytest
 
 from miseqinteropreader import InterOpReader, MetricFile
-from miseqinteropreader.models import ErrorRecord, QualityRecord, TileMetricRecord
+from miseqinteropreader.models import (
+    BaseRecord,
+    ErrorRecord,
+    QualityRecord,
+    TileMetricRecord,
+)
+
+RecordT = TypeVar("RecordT", bound=BaseRecord)
+
+RUNS_PATH = Path("/media/raw_data/MiSeq/runs")
+RUN_NAME = re.compile(r"\d{6}_M\d{5}_\d{4}_0{9}-[A-Z0-9]{5}")
 
 
 @pytest.fixture(scope="session")
@@ -14,23 +26,79 @@ def seeded_rng() -> Random:
     return Random(12345)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def random_interop_folder(seeded_rng: Random) -> Path:
-    runspath = Path("/media/raw_data/MiSeq/runs")
     possible_folders: list[Path] = []
-    for folder in runspath.glob("*"):
-        if not folder.is_dir():
-            continue
-        if re.search(r"\d{6}_M\d{5}_\d{4}_0{9}-[A-Z0-0]{5}", folder.name):
-            if not (folder / "InterOp").exists():
+    with os.scandir(RUNS_PATH) as entries:
+        for entry in entries:
+            if not entry.is_dir() or not RUN_NAME.search(entry.name):
                 continue
-            possible_folders.append(folder)
+            folder = Path(entry.path)
+            if (folder / "InterOp").exists():
+                possible_folders.append(folder)
 
     return seeded_rng.choice(possible_folders)
 
 
+@pytest.fixture(scope="session")
+def interop_reader(random_interop_folder: Path) -> InterOpReader:
+    return InterOpReader(random_interop_folder)
+
+
+def cached_records(
+    config: pytest.Config,
+    reader: InterOpReader,
+    metric: MetricFile,
+    read: Callable[[], Sequence[RecordT]],
+) -> Sequence[RecordT]:
+    """Call `read`, or with --cached, load its result from the pytest cache.
+
+    Cached records are keyed by the metric file's modification time, so they
+    are parsed again if the file changes.
+    """
+    if not config.getoption("cached") or config.cache is None:
+        return read()
+    path = reader.get_file(metric)
+    cache_dir = config.cache.mkdir("interop_records")
+    cache_file = cache_dir / f"{reader.run_name}-{path.stem}-{path.stat().st_mtime_ns}"
+    try:
+        with cache_file.open("rb") as f:
+            cached: Sequence[RecordT] = pickle.load(f)
+        return cached
+    except FileNotFoundError:
+        pass
+    records = read()
+    with cache_file.open("wb") as f:
+        pickle.dump(records, f)
+    return records
+
+
+@pytest.fixture(scope="session")
+def quality_records(
+    pytestconfig: pytest.Config, interop_reader: InterOpReader
+) -> Sequence[QualityRecord]:
+    return cached_records(
+        pytestconfig,
+        interop_reader,
+        MetricFile.QUALITY_METRICS,
+        interop_reader.read_quality_records,
+    )
+
+
+@pytest.fixture(scope="session")
+def tile_records(
+    pytestconfig: pytest.Config, interop_reader: InterOpReader
+) -> Sequence[TileMetricRecord]:
+    return cached_records(
+        pytestconfig,
+        interop_reader,
+        MetricFile.TILE_METRICS,
+        interop_reader.read_tile_records,
+    )
+
+
 @pytest.mark.skipif(
-    condition=not Path("/media/raw_data/MiSeq/runs").exists(),
+    condition=not RUNS_PATH.exists(),
     reason="Unable to perform test without access to the raw_data drive",
 )
 @pytest.mark.skipif(
@@ -38,8 +106,8 @@ def random_interop_folder(seeded_rng: Random) -> Path:
     reason="Unable to perform test in CI.",
 )
 class TestIntegrations:
-    def test_read_interop_dir(self, random_interop_folder: Path):
-        ior = InterOpReader(random_interop_folder)
+    def test_read_interop_dir(self, interop_reader: InterOpReader):
+        ior = interop_reader
         print(f"Testing with {ior.run_name}")
         files_present = ior.check_files_present(
             {
@@ -79,8 +147,12 @@ class TestIntegrations:
                 for record in records:
                     assert isinstance(record, metric.value.model)
 
-    def test_summarize_quality_metrics(self, random_interop_folder: Path):
-        ior = InterOpReader(random_interop_folder)
+    def test_summarize_quality_metrics(
+        self,
+        interop_reader: InterOpReader,
+        quality_records: Sequence[QualityRecord],
+    ):
+        ior = interop_reader
         print(f"Testing with {ior.run_name}")
         files_present = ior.check_files_present({MetricFile.QUALITY_METRICS})
 
@@ -88,11 +160,10 @@ class TestIntegrations:
         assert ior.qc_uploaded
         assert ior.needsprocessing
 
-        records = ior.read_quality_records()
-        for record in records:
+        for record in quality_records:
             assert isinstance(record, QualityRecord)
 
-        summary = ior.summarize_quality_records(records)
+        summary = ior.summarize_quality_records(quality_records)
 
         assert summary.total_reverse == 0
         assert summary.total_count > 0
@@ -102,8 +173,13 @@ class TestIntegrations:
         assert summary.q30_forward == (summary.good_count / summary.total_count)
         assert summary.q30_reverse == 0.0
 
-    def test_summarize_tile_metrics(self, random_interop_folder: Path):
-        ior = InterOpReader(random_interop_folder)
+    def test_summarize_tile_metrics(
+        self,
+        interop_reader: InterOpReader,
+        tile_records: Sequence[TileMetricRecord],
+        quality_records: Sequence[QualityRecord],
+    ):
+        ior = interop_reader
         print(f"Testing with {ior.run_name}")
         files_present = ior.check_files_present({MetricFile.TILE_METRICS})
 
@@ -111,7 +187,6 @@ class TestIntegrations:
         assert ior.qc_uploaded
         assert ior.needsprocessing
 
-        tile_records = ior.read_tile_records()
         for tile_record in tile_records:
             assert isinstance(tile_record, TileMetricRecord)
 
@@ -128,7 +203,6 @@ class TestIntegrations:
             tile_summary.density_sum / tile_summary.density_count
         )
 
-        quality_records = ior.read_quality_records()
         for quality_record in quality_records:
             assert isinstance(quality_record, QualityRecord)
         quality_summary = ior.summarize_quality_records(quality_records)
@@ -159,9 +233,12 @@ class TestIntegrations:
         ],
     )
     def test_summarize_tile_metrics_as_df(
-        self, metricfile: MetricFile, random_interop_folder: Path
+        self,
+        metricfile: MetricFile,
+        interop_reader: InterOpReader,
+        seeded_rng: Random,
     ):
-        ior = InterOpReader(random_interop_folder)
+        ior = interop_reader
         print(f"Testing with {ior.run_name}")
         files_present = ior.check_files_present({metricfile})
 
@@ -171,17 +248,14 @@ class TestIntegrations:
 
         results = ior.read_generic_records(metricfile)
         df = ior.read_file_to_dataframe(metricfile)
+        derived = metricfile.value.model.derived_columns(
+            ior.read_generic_array(metricfile)
+        )
 
         assert len(results) == len(df.index)
-        assert list(results[0].model_dump().keys()) == list(df)
-
-        random_rows = []
-        rng = Random()
-        for i in range(50):
-            random_rows.append(rng.randint(0, len(results) - 1))
-
-        for row_id in random_rows:
-            result = results[row_id].model_dump()
-            result_df = df.iloc[row_id].to_dict(into=dict)
+        columns = list(results[0].model_dump().keys())
+        assert list(df) == columns + list(derived)
 
-            assert result == result_df
+        df_records = df[columns].to_dict(orient="records")
+        for row_id in seeded_rng.sample(range(len(results)), min(50, len(results))):
+            assert results[row_id].model_dump() == df_records[row_id]
@@ -1,10 +1,14 @@
 from pathlib import Path
 from random import Random
+from typing import Any
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
 import pytest
 
 from miseqinteropreader import InterOpReader, MetricFile
-from miseqinteropreader.models import TileMetricRecord
+from miseqinteropreader.models import ReadLengths3, TileMetricRecord
 
 
 def test_run_dir_missing(tmp_path: Path):
@@ -76,6 +80,17 @@ def test_interopreader(run_dir: Path, tile_metric_row: list[list[int | float]],
     for record in records:
         assert isinstance(record, TileMetricRecord)
 
+def test_read_generic_records_parses_once(run_dir: Path, tile_metric_file: Path):
+    (run_dir / "SampleSheet.csv").touch()
+    ior = InterOpReader(run_dir)
+
+    records = ior.read_generic_records(MetricFile.TILE_METRICS)
+    tile_metric_file.unlink()
+
+    assert ior.read_generic_records(MetricFile.TILE_METRICS) is records
+    assert isinstance(records, tuple)
+    assert len(ior.read_tile_records()) == len(records)
+
 def test_interopreader_02(
     run_dir: Path,
     tile_metric_row: list[list[int | float]],
@@ -138,3 +153,197 @@ def test_interopreader_02(
 
         for row in records:
             assert isinstance(row, kind.value.model)
+
+
+def test_interopreader_dataframe(
+    run_dir: Path,
+    tile_metric_file: Path,
+    extended_tile_metric_file: Path,
+    extraction_metric_file: Path,
+    corrected_intensity_metric_file: Path,
+    image_metric_file: Path,
+    phasing_metric_file: Path,
+    collapsed_q_metric_file: Path,
+    quality_metric_file: Path,
+    error_metric_file: Path,
+):
+    (run_dir / "SampleSheet.csv").touch()
+
+    ior = InterOpReader(run_dir)
+    for kind in MetricFile:
+        metric = kind.value
+        if metric.binary_format is None:
+            continue
+        records = metric.read_file(ior.interop_dir)
+        expected = pd.DataFrame(data=[el.model_dump() for el in records])
+        df = ior.read_file_to_dataframe(kind)
+
+        # derived columns match the model properties they are vectorized from
+        derived = metric.model.derived_columns(metric.read_array(ior.interop_dir))
+        for name in derived:
+            model_values = pd.Series([getattr(el, name) for el in records])
+            assert (df[name] == model_values).all()
+        pd.testing.assert_frame_equal(df.drop(columns=list(derived)), expected)
+
+        table = ior.read_file_to_table(kind)
+        pd.testing.assert_frame_equal(table.to_pandas(), df)
+
+
+def test_array_columns_dtypes():
+    metric = MetricFile.EXTRACTION_METRICS.value
+    assert metric.binary_format is not None
+    array = np.zeros(2, dtype=metric.binary_format.record_dtype())
+
+    columns = metric._array_columns(array)
+    assert columns["lane"].dtype == np.int64
+    assert columns["max_intensity_a"].dtype == np.int64
+    assert columns["focus_a"].dtype == np.float64
+    assert columns["datestamp"].dtype == np.int64
+
+    # the kind bits of a datestamp do not fit in an int64
+    array["datestamp"][0] = (1 << 63) | 5
+    columns = metric._array_columns(array)
+    assert columns["datestamp"].dtype == np.uint64
+    assert columns["datestamp"][0] == (1 << 63) | 5
+
+
+def test_record_count(
+    prepared_run_dir: Path,
+    tile_metric_row: list[list[int | float]],
+    tile_metric_file: Path,
+    index_metric_file: Path,
+):
+    ior = InterOpReader(prepared_run_dir)
+
+    assert ior.record_count(MetricFile.TILE_METRICS) == len(tile_metric_row)
+    assert ior.record_count(MetricFile.INDEX_METRICS) is None
+
+    data = tile_metric_file.read_bytes()
+    tile_metric_file.write_bytes(data[:2])
+    assert ior.record_count(MetricFile.TILE_METRICS) == 0
+
+    # A truncated record is an error, not an empty file
+    tile_metric_file.write_bytes(data[:3])
+    with pytest.raises(RuntimeError, match="Partial record of length 1"):
+        ior.record_count(MetricFile.TILE_METRICS)
+
+    # The header's record length must fit a whole record
+    tile_metric_file.write_bytes(data[:1] + b"\x04" + data[2:6])
+    with pytest.raises(ValueError, match="shorter than"):
+        ior.record_count(MetricFile.TILE_METRICS)
+
+
+def test_iter_file_tables(
+    prepared_run_dir: Path,
+    tile_metric_file: Path,
+    extraction_metric_file: Path,
+    index_metric_file: Path,
+):
+    ior = InterOpReader(prepared_run_dir)
+    for kind in (
+        MetricFile.TILE_METRICS,
+        MetricFile.EXTRACTION_METRICS,
+        MetricFile.INDEX_METRICS,
+    ):
+        tables = list(ior.iter_file_tables(kind, batch_size=3))
+        assert all(table.num_rows <= 3 for table in tables)
+        # Variable-width tables skip pandas, so string types may differ in size
+        expected = ior.read_file_to_table(kind)
+        assert pa.concat_tables(tables).to_pylist() == expected.to_pylist()
+
+
+@pytest.mark.parametrize(
+    "read_lengths",
+    [
+        None,
+        ReadLengths3(forward_read=20000, indexes_combined=10000, reverse_read=20000),
+    ],
+)
+def test_summarize_quality_array(
+    run_dir: Path,
+    quality_metric_file: Path,
+    read_lengths: ReadLengths3 | None,
+):
+    (run_dir / "SampleSheet.csv").touch()
+
+    ior = InterOpReader(run_dir)
+    records = ior.read_quality_records()
+    array = ior.read_generic_array(MetricFile.QUALITY_METRICS)
+
+    expected_count = sum(sum(record.quality_bins) for record in records)
+    summary = ior.summarize_quality_records(records, read_lengths)
+
+    assert ior.summarize_quality_records(array, read_lengths) == summary
+    if read_lengths is None:
+        assert summary.total_count == expected_count
+        assert summary.total_reverse == 0
+
+
+def test_summarize_tile_array(run_dir: Path, tile_metric_file: Path):
+    (run_dir / "SampleSheet.csv").touch()
+
+    ior = InterOpReader(run_dir)
+    records = ior.read_tile_records()
+    array = ior.read_generic_array(MetricFile.TILE_METRICS)
+
+    summary = ior.summarize_tile_records(records)
+    array_summary = ior.summarize_tile_records(array)
+
+    assert array_summary.density_count == summary.density_count
+    assert array_summary.density_sum == pytest.approx(summary.density_sum)
+    assert array_summary.total_clusters == pytest.approx(summary.total_clusters)
+    assert array_summary.passing_clusters == pytest.approx(summary.passing_clusters)
+
+
+def test_interopreader_get_file(run_dir: Path, tile_metric_file: Path):
+    (run_dir / "SampleSheet.csv").touch()
+
+    ior = InterOpReader(run_dir)
+
+    assert ior.get_file(MetricFile.TILE_METRICS) == tile_metric_file
+    with pytest.raises(FileNotFoundError):
+        ior.get_file(MetricFile.QUALITY_METRICS)
+
+
+def test_interopreader_reads_use_listing(
+    run_dir: Path, tile_metric_file: Path, monkeypatch: pytest.MonkeyPatch
+):
+    (run_dir / "SampleSheet.csv").touch()
+
+    ior = InterOpReader(run_dir)
+    assert ior.interop_filenames
+
+    looked_up: list[Path] = []
+    exists = Path.exists
+
+    def recording_exists(self: Path, *args: Any, **kwargs: Any) -> bool:
+        looked_up.append(self)
+        return exists(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "exists", recording_exists)
+    metric = MetricFile.TILE_METRICS
+    assert ior.record_count(metric) == len(ior.read_generic_array(metric))
+    records = ior.read_generic_records(metric)
+    assert len(records) == len(list(ior.iter_generic_records(metric)))
+    table = ior.read_file_to_table(metric)
+    assert table.num_rows == len(ior.read_file_to_dataframe(metric))
+    assert sum(t.num_rows for t in ior.iter_file_tables(metric)) == table.num_rows
+    monkeypatch.undo()
+
+    # Every read path found its file in the cached listing
+    assert not [path for path in looked_up if path.parent == ior.interop_dir]
+
+
+def test_interopreader_markers(run_dir: Path):
+    (run_dir / "SampleSheet.csv").touch()
+
+    ior = InterOpReader(run_dir)
+    assert ior.needsprocessing
+    assert ior.qc_uploaded
+
+    (run_dir / "needsprocessing").unlink()
+    (run_dir / "qc_uploaded").unlink()
+
+    ior = InterOpReader(run_dir)
+    assert not ior.needsprocessing
+    assert not ior.qc_uploaded
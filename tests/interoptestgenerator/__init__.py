@@ -1,5 +1,6 @@
 # noqa: F401
 from .gen_data import (
+    SAMPLE_SHEET,
     CollapsedQRecordGenerator,
     CorrectedIntensityRecordGenerator,
     ErrorRecordGenerator,
@@ -13,6 +14,7 @@ from .gen_data import (
 )
 
 __all__ = [
+    "SAMPLE_SHEET",
     "CollapsedQRecordGenerator",
     "CorrectedIntensityRecordGenerator",
     "ErrorRecordGenerator",
@@ -1,12 +1,37 @@
+import os
 import string
+from functools import lru_cache
 from pathlib import Path
 from random import Random
-from struct import pack
+from struct import Struct, pack
 from typing import Any, Iterator
 
-from miseqinteropreader.interop_reader import Metric, MetricFile
+import numpy as np
+import numpy.typing as npt
+
+from miseqinteropreader.interop_reader import MetricFile
 from miseqinteropreader.read_records import BinaryFormat
 
+# Minimal SampleSheet.csv contents; the reader only checks that the file exists.
+SAMPLE_SHEET = b"[Header]\nRun,test"
+
+
+def _random_column(
+    rng: np.random.Generator, dtype: np.dtype[Any], num_rows: int
+) -> npt.NDArray[Any]:
+    if dtype.kind == "f":
+        return rng.random(num_rows, dtype=np.float32)
+    return rng.integers(0, np.iinfo(dtype).max, num_rows, dtype=dtype, endpoint=True)
+
+
+@lru_cache(maxsize=256)
+def _index_struct(
+    index_name_length: int, sample_name_length: int, project_name_length: int
+) -> Struct:
+    return Struct(
+        f"<HHHH{index_name_length}sIH{sample_name_length}sH{project_name_length}s"
+    )
+
 
 class BaseGenerator:
     def __init__(self) -> None:
@@ -15,31 +40,27 @@ class BaseGenerator:
         self.header_values: tuple[int, ...] = (1, 1)
         self.metricfile = MetricFile.SUMMARY_RUN.value
 
-    def _generate_numeric_sequence(
-        self, binary_format: str, rng: Random
-    ) -> list[int | float]:
-        outlist: list[int | float] = []
-        for char in binary_format:
-            if char == "<":
-                continue
-            elif char == "H":
-                outlist.append(rng.randint(0, 2**16 - 1))
-            elif char == "f":
-                outlist.append(rng.random())
-            elif char == "L":
-                outlist.append(rng.randint(0, 2**32 - 1))
-            elif char == "I":
-                outlist.append(rng.randint(0, 2**32 - 1))
-            elif char == "Q":
-                outlist.append(rng.randint(0, 2**64 - 1))
-        return outlist
-
-    def generate_row(self, rand: Random) -> list[Any]:
-        return self._generate_numeric_sequence(self._binary_format.format, rand)
+    def generate_array(self, rand: Random, num_rows: int) -> npt.NDArray[np.void]:
+        """Draw `num_rows` random records, one whole column at a time."""
+        rng = np.random.default_rng(rand.getrandbits(64))
+        dtype = self._binary_format.record_dtype()
+        assert dtype.fields is not None
+        array = np.empty(num_rows, dtype=dtype)
+        for name, (field_dtype, *_) in dtype.fields.items():
+            array[name] = _random_column(rng, field_dtype, num_rows)
+        return array
+
+    def generate_rows(self, rand: Random, num_rows: int) -> list[list[Any]]:
+        return [list(row) for row in self.generate_array(rand, num_rows).tolist()]
 
     def generate_binary(self, row_data: list[list[Any]]) -> Iterator[bytes]:
+        record = Struct(self._binary_format.format)
         for row in row_data:
-            yield pack(self._binary_format.format, *row)
+            yield record.pack(*row)
+
+    def generate_binary_contiguous(self, row_data: list[list[Any]]) -> bytes:
+        dtype = self._binary_format.record_dtype()
+        return np.array([tuple(row) for row in row_data], dtype=dtype).tobytes()
 
     def gen_header(
         self, format: str | None = None, values: tuple[int, ...] | None = None
@@ -61,16 +82,19 @@ class BaseGenerator:
         if filename.is_dir():
             filename = file / self.metricfile.files[0]
 
-        with open(filename, mode="wb") as f:
-            if header is None:
-                f.write(self.gen_header())
-            else:
-                f.write(header)
-            if isinstance(binary_data, list):
-                for bin in binary_data:
-                    f.write(bin)
-            else:
-                f.write(binary_data)
+        if header is None:
+            header = self.gen_header()
+        if isinstance(binary_data, list):
+            data = b"".join([header, *binary_data])
+        else:
+            data = header + binary_data
+
+        # The files are tiny, so skip the buffered writer and write them directly.
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
 
         return file
 
@@ -106,17 +130,12 @@ class IndexRecordGenerator(BaseGenerator):
 
         return data
 
+    def generate_rows(self, rand: Random, num_rows: int) -> list[list[Any]]:
+        return [self.generate_row(rand) for _ in range(num_rows)]
+
     def generate_binary(self, row_data: list[list[Any]]) -> Iterator[bytes]:
         for row in row_data:
-            bytepack = [
-                "<HHH",
-                "H" + f"{row[3]}s",
-                "I",
-                "H" + f"{row[6]}s",
-                "H" + f"{row[8]}s",
-            ]
-            data = pack("".join(bytepack), *row)
-            yield data
+            yield _index_struct(row[3], row[6], row[8]).pack(*row)
 
 
 class QualityRecordGenerator(BaseGenerator):
@@ -180,11 +199,14 @@ class ExtractionRecordGenerator(BaseGenerator):
         self.metricfile = MetricFile.EXTRACTION_METRICS.value
 
 
-    def generate_row(self, rand: Random) -> list[Any]:
+    def generate_array(self, rand: Random, num_rows: int) -> npt.NDArray[np.void]:
         # special handling for this one as the date format is a bit whacky
-        row = self._generate_numeric_sequence(self._binary_format.format, rand)
-        row[-1] = 2**48 + rand.randint(0, 2**32)
-        return row
+        array = super().generate_array(rand, num_rows)
+        rng = np.random.default_rng(rand.getrandbits(64))
+        array["datestamp"] = 2**48 + rng.integers(
+            0, 2**32, num_rows, dtype=np.uint64, endpoint=True
+        )
+        return array
 
 class ImageRecordGenerator(BaseGenerator):
     def __init__(self) -> None:
@@ -4,7 +4,7 @@ from typing import Any
 import pytest
 from pydantic import ValidationError
 
-from miseqinteropreader.models import QualityRecord
+from miseqinteropreader.models import PhasingRecord, QualityRecord
 
 
 @pytest.mark.parametrize(
@@ -33,3 +33,40 @@ def test_quality_record_model(record_length: int, exp_raises: Any):
             assert isinstance(k, str)
             assert isinstance(v, int)
             assert isinstance(v, int)
+
+
+@pytest.mark.parametrize(
+    "cycle, exp_raises",
+    [
+        pytest.param(-1, pytest.raises(ValidationError), id="negative"),
+        pytest.param(0, nullcontext(), id="zero"),
+        pytest.param(2**16 - 1, nullcontext(), id="max uint16"),
+        pytest.param(2**16, pytest.raises(ValidationError), id="too big"),
+    ],
+)
+def test_uint_range(cycle: int, exp_raises: Any):
+    with exp_raises:
+        PhasingRecord(
+            lane=0, tile=1, cycle=cycle, phasing_weight=0.1, prephasing_weight=0.2
+        )
+
+
+def test_record_equality():
+    bins = list(range(50))
+    record = QualityRecord(lane=0, tile=1, cycle=2, quality_bins=bins)
+
+    assert record == QualityRecord(lane=0, tile=1, cycle=2, quality_bins=bins)
+    assert record != QualityRecord(lane=0, tile=1, cycle=3, quality_bins=bins)
+    assert record != PhasingRecord(
+        lane=0, tile=1, cycle=2, phasing_weight=0.5, prephasing_weight=0.5
+    )
+
+    phasing = PhasingRecord(
+        lane=0, tile=1, cycle=2, phasing_weight=0.1, prephasing_weight=0.2
+    )
+    assert phasing == PhasingRecord(
+        lane=0, tile=1, cycle=2, phasing_weight=0.1 + 1e-9, prephasing_weight=0.2
+    )
+    assert phasing != PhasingRecord(
+        lane=0, tile=1, cycle=2, phasing_weight=0.11, prephasing_weight=0.2
+    )
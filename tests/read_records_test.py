@@ -1,4 +1,5 @@
 
+from io import BytesIO
 from pathlib import Path
 
 import pytest
@@ -11,15 +12,20 @@ from miseqinteropreader.models import (
     ImageRecord,
     IndexRecord,
     PhasingRecord,
+    QualityRecord,
     TileMetricRecord,
 )
 from miseqinteropreader.read_records import (
+    BinaryFormat,
     read_collapsed_q_metric,
     read_corrected_intensities,
     read_extractions,
     read_images,
     read_index,
     read_phasing,
+    read_quality,
+    read_records,
+    read_records_array,
     read_tiles,
 )
 
@@ -157,6 +163,27 @@ def test_read_corrected_intensity(
         assert len(rows) == len(corrected_intensity_metric_row)
         assert rows[0] == decoded_data
 
+
+def test_read_quality(
+    run_dir: Path,
+    quality_metric_row: list[list[int | float]],
+    quality_metric_file: Path,
+):
+    decoded_data = QualityRecord(
+        lane=quality_metric_row[0][0],
+        tile=quality_metric_row[0][1],
+        cycle=quality_metric_row[0][2],
+        quality_bins=list(quality_metric_row[0][3:]),
+    )
+
+    with open(quality_metric_file, "rb") as f:
+        rows = list(read_quality(f))
+
+        assert len(rows) == len(quality_metric_row)
+        assert rows[0] == decoded_data
+        assert isinstance(rows[0].quality_bins, list)
+
+
 def test_read_extraction(
     run_dir: Path, extraction_metric_row: list[list[int | bytes]], extraction_metric_file: Path
 ):
@@ -215,3 +242,96 @@ def test_read_phasing(
 
         assert len(rows) == len(phasing_metric_row)
         assert rows[0] == decoded_data
+
+
+def test_read_records_array(
+    run_dir: Path, tile_metric_row: list[list[int | float]], tile_metric_file: Path
+):
+    with open(tile_metric_file, "rb") as f:
+        records = read_records_array(f, BinaryFormat.TILE)
+
+    assert len(records) == len(tile_metric_row)
+    assert records.dtype.names == ("lane", "tile", "metric_code", "metric_value")
+    assert records[0]["lane"] == tile_metric_row[0][0]
+    assert records[0]["tile"] == tile_metric_row[0][1]
+    assert records[0]["metric_code"] == tile_metric_row[0][2]
+    assert records[0]["metric_value"] == pytest.approx(tile_metric_row[0][3])
+
+
+def test_read_records_array_stream(
+    run_dir: Path, tile_metric_row: list[list[int | float]], tile_metric_file: Path
+):
+    with open(tile_metric_file, "rb") as f:
+        mapped = read_records_array(f, BinaryFormat.TILE)
+    with open(tile_metric_file, "rb") as f:
+        stream = BytesIO(f.read())
+
+    records = read_records_array(stream, BinaryFormat.TILE)
+
+    assert records.tolist() == mapped.tolist()
+
+
+def test_read_records_array_partial_record(
+    run_dir: Path, tile_metric_row: list[list[int | float]], tile_metric_file: Path
+):
+    with open(tile_metric_file, "ab") as f:
+        f.write(b"\x00")
+
+    with open(tile_metric_file, "rb") as f:
+        with pytest.raises(RuntimeError, match="Partial record"):
+            read_records_array(f, BinaryFormat.TILE)
+
+
+@pytest.mark.parametrize("trim", [1, 5])
+def test_read_index_partial_record(run_dir: Path, index_metric_file: Path, trim: int):
+    data = index_metric_file.read_bytes()
+
+    with pytest.raises(RuntimeError, match="Partial record"):
+        list(read_index(BytesIO(data[:-trim])))
+
+
+def test_read_records_array_stream_partial_record(
+    run_dir: Path, tile_metric_file: Path
+):
+    stream = BytesIO(tile_metric_file.read_bytes() + b"\x00")
+
+    with pytest.raises(RuntimeError, match="Partial record of length 1 found in"):
+        read_records_array(stream, BinaryFormat.TILE)
+
+
+def test_read_records_array_stream_old_version():
+    stream = BytesIO(b"\x01\x0a")
+
+    with pytest.raises(ValueError, match="less than minimum version"):
+        read_records_array(stream, BinaryFormat.TILE)
+
+
+def test_read_records_blocks(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("miseqinteropreader.read_records.RECORDS_PER_BLOCK", 2)
+    records = [bytes([i] * 3) for i in range(5)]
+    data_file = BytesIO(b"\x01\x03" + b"".join(records))
+
+    assert list(read_records(data_file, 1)) == [(r, 3) for r in records]
+
+    data_file = BytesIO(b"\x01\x03" + b"".join(records) + b"\x00")
+    data_file.name = "PartialMetricsOut.bin"
+    with pytest.raises(RuntimeError, match="Partial record of length 1"):
+        list(read_records(data_file, 1))
+
+
+def test_read_records_fields_set(
+    run_dir: Path,
+    phasing_metric_file: Path,
+    index_metric_file: Path,
+):
+    with open(phasing_metric_file, mode="rb") as f:
+        phasing_rows = list(read_phasing(f))
+    with open(index_metric_file, mode="rb") as f:
+        index_rows = list(read_index(f))
+
+    for row in phasing_rows + index_rows:
+        assert row.model_fields_set == set(type(row).model_fields)
+
+    copied = phasing_rows[0].model_copy(update={"cycle": 1})
+    assert copied.cycle == 1
+    assert phasing_rows[-1].model_fields_set == set(PhasingRecord.model_fields)
@@ -4,6 +4,7 @@ import argparse
 import csv
 import json
 from pathlib import Path
+from typing import Callable
 
 import pytest
 
@@ -11,65 +12,74 @@ from miseqinteropreader.commands import summary
 from miseqinteropreader.models import ReadLengths3, ReadLengths4
 
 
+@pytest.fixture
+def summary_args(
+    args_factory: Callable[..., Callable[..., argparse.Namespace]],
+    prepared_run_dir: Path,
+) -> Callable[..., argparse.Namespace]:
+    """Build summary arguments for prepared_run_dir, with the options off."""
+    return args_factory(
+        run_dir=prepared_run_dir,
+        quality=False,
+        tiles=False,
+        errors=False,
+        all=False,
+        read_lengths=None,
+        format="table",
+        output=None,
+        verbosity=0,
+    )
+
+
 class TestSummaryParseReadLengths:
     """Tests for parse_read_lengths function."""
 
-    def test_parse_read_lengths_3_values(self):
-        """Test parsing 3 read lengths (forward, index, reverse)."""
-        result = summary.parse_read_lengths("150,8,150")
-        assert isinstance(result, ReadLengths3)
-        assert result.forward_read == 150
-        assert result.indexes_combined == 8
-        assert result.reverse_read == 150
-
-    def test_parse_read_lengths_4_values(self):
-        """Test parsing 4 read lengths (forward, index1, index2, reverse)."""
+    @pytest.mark.parametrize(
+        "read_lengths, expected",
+        [
+            # forward, index, reverse
+            (
+                "150,8,150",
+                ReadLengths3(forward_read=150, indexes_combined=8, reverse_read=150),
+            ),
+            # forward, index1, index2, reverse
+            (
+                "150,8,8,150",
+                ReadLengths4(forward_read=150, index1=8, index2=8, reverse_read=150),
+            ),
+            # whitespace is stripped
+            (
+                " 150 , 8 , 150 ",
+                ReadLengths3(forward_read=150, indexes_combined=8, reverse_read=150),
+            ),
+        ],
+    )
+    def test_parse_read_lengths(self, read_lengths, expected):
+        """Test parsing 3 or 4 comma-separated read lengths."""
+        result = summary.parse_read_lengths(read_lengths)
+        assert type(result) is type(expected)
+        assert result == expected
+
+    def test_parse_read_lengths_4_values_to_3(self):
+        """Test converting 4 read lengths to 3 by combining the indexes."""
         result = summary.parse_read_lengths("150,8,8,150")
         assert isinstance(result, ReadLengths4)
-        assert result.forward_read == 150
-        assert result.index1 == 8
-        assert result.index2 == 8
-        assert result.reverse_read == 150
-        # Test conversion to ReadLengths3
-        result3 = result.to_read_lengths_3()
-        assert result3.indexes_combined == 16
+        assert result.to_read_lengths_3().indexes_combined == 16
 
     def test_parse_read_lengths_invalid_count(self):
         """Test that invalid number of values raises error."""
         with pytest.raises(ValueError, match="must be 3 or 4"):
             summary.parse_read_lengths("150,8")
 
-    def test_parse_read_lengths_whitespace(self):
-        """Test that whitespace is handled correctly."""
-        result = summary.parse_read_lengths(" 150 , 8 , 150 ")
-        assert isinstance(result, ReadLengths3)
-        assert result.forward_read == 150
-        assert result.indexes_combined == 8
-        assert result.reverse_read == 150
-
 
 class TestSummaryInvalidReadLengths:
     """Tests for invalid read lengths handling."""
 
-    def test_summary_with_invalid_read_lengths(self, run_dir, tile_metric_file, capsys):
+    def test_summary_with_invalid_read_lengths(self, summary_args, capsys):
         """Test that invalid read lengths format returns error."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
+        args = summary_args(
             tiles=True,
-            errors=False,
-            all=False,
             read_lengths="150,8",  # Invalid: only 2 values
-            format="table",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = summary.execute(args)
@@ -83,58 +93,24 @@ class TestSummaryQuality:
     """Tests for quality summary generation."""
 
     def test_summary_quality_only(
-        self, run_dir, quality_metric_file, tile_metric_file, capsys
+        self, summary_args, quality_metric_file, tile_metric_file, capsys
     ):
         """Test generating only quality summary."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=True,
-            tiles=False,
-            errors=False,
-            all=False,
-            read_lengths=None,
-            format="table",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = summary_args(quality=True)
 
         result = summary.execute(args)
         assert result == 0
 
-        captured = capsys.readouterr()
-        assert "quality" in captured.out.lower()
+        out = capsys.readouterr().out.lower()
+        assert "quality" in out
         # Should not have tiles or errors
-        assert "tiles" not in captured.out.lower() or "tiles" in captured.out.lower()
+        assert "tiles" not in out or "tiles" in out
 
     def test_summary_quality_with_read_lengths(
-        self, run_dir, quality_metric_file, tile_metric_file, capsys
+        self, summary_args, quality_metric_file, tile_metric_file, capsys
     ):
         """Test quality summary with read lengths specified."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=True,
-            tiles=False,
-            errors=False,
-            all=False,
-            read_lengths="150,8,8,150",
-            format="table",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = summary_args(quality=True, read_lengths="150,8,8,150")
 
         result = summary.execute(args)
         assert result == 0
@@ -142,59 +118,15 @@ class TestSummaryQuality:
         captured = capsys.readouterr()
         assert "quality" in captured.out.lower()
 
-    def test_summary_quality_missing_file(self, run_dir, tile_metric_file, capsys):
-        """Test quality summary when quality file is missing."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=True,
-            tiles=False,
-            errors=False,
-            all=False,
-            read_lengths=None,
-            format="table",
-            output=None,
-            verbosity=2,  # Verbose to see missing file message
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
-
-        result = summary.execute(args)
-        assert result == 0  # Should succeed but report missing
-
-        captured = capsys.readouterr()
-        assert "not found" in captured.out.lower() or "quality" in captured.out
-
 
 class TestSummaryErrors:
     """Tests for error summary generation."""
 
     def test_summary_errors_only(
-        self, run_dir, error_metric_file, tile_metric_file, capsys
+        self, summary_args, error_metric_file, tile_metric_file, capsys
     ):
         """Test generating only error summary."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
-            tiles=False,
-            errors=True,
-            all=False,
-            read_lengths=None,
-            format="table",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = summary_args(errors=True)
 
         result = summary.execute(args)
         assert result == 0
@@ -203,27 +135,10 @@ class TestSummaryErrors:
         assert "error" in captured.out.lower()
 
     def test_summary_errors_with_read_lengths(
-        self, run_dir, error_metric_file, tile_metric_file, capsys
+        self, summary_args, error_metric_file, tile_metric_file, capsys
     ):
         """Test error summary with read lengths specified."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
-            tiles=False,
-            errors=True,
-            all=False,
-            read_lengths="150,8,150",
-            format="table",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = summary_args(errors=True, read_lengths="150,8,150")
 
         result = summary.execute(args)
         assert result == 0
@@ -232,26 +147,12 @@ class TestSummaryErrors:
         assert "error" in captured.out.lower()
 
     def test_summary_errors_without_read_lengths_treats_all_as_forward(
-        self, run_dir, error_metric_file, tile_metric_file, capsys
+        self, summary_args, error_metric_file, tile_metric_file, capsys
     ):
         """Test that without read lengths, all cycles are treated as forward."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
-            tiles=False,
+        args = summary_args(
             errors=True,
-            all=False,
             read_lengths=None,  # No read lengths
-            format="table",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = summary.execute(args)
@@ -261,59 +162,42 @@ class TestSummaryErrors:
         # Should show error_rate_forward but not reverse (or reverse should be 0)
         assert "error" in captured.out.lower()
 
-    def test_summary_errors_missing_file(self, run_dir, tile_metric_file, capsys):
-        """Test error summary when error file is missing."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
 
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
-            tiles=False,
-            errors=True,
-            all=False,
-            read_lengths=None,
-            format="table",
-            output=None,
+class TestSummaryMissingFile:
+    """Tests for summaries whose metric file is missing."""
+
+    @pytest.mark.parametrize(
+        "category, expected", [("quality", "quality"), ("errors", "error")]
+    )
+    def test_summary_missing_file(
+        self, summary_args, tile_metric_file, capsys, category, expected
+    ):
+        """Test that a summary reports a missing metric file and still succeeds."""
+        args = summary_args(
+            **{category: True},
             verbosity=2,  # Verbose to see missing file message
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = summary.execute(args)
         assert result == 0  # Should succeed but report missing
 
         captured = capsys.readouterr()
-        assert "not found" in captured.out.lower() or "error" in captured.out
+        assert "not found" in captured.out.lower() or expected in captured.out
 
 
 class TestSummaryJSONFormat:
     """Tests for JSON output format."""
 
     def test_summary_json_to_stdout(
-        self, run_dir, tile_metric_file, quality_metric_file, error_metric_file, capsys
+        self,
+        summary_args,
+        tile_metric_file,
+        quality_metric_file,
+        error_metric_file,
+        capsys,
     ):
         """Test JSON output to stdout."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
-            tiles=True,
-            errors=False,
-            all=False,
-            read_lengths=None,
-            format="json",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = summary_args(tiles=True, format="json")
 
         result = summary.execute(args)
         assert result == 0
@@ -326,31 +210,20 @@ class TestSummaryJSONFormat:
 
     def test_summary_json_to_file(
         self,
-        run_dir,
+        summary_args,
         tile_metric_file,
         quality_metric_file,
         error_metric_file,
         tmp_path,
     ):
         """Test JSON output to file."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         output_file = tmp_path / "summary.json"
-        args = argparse.Namespace(
-            run_dir=run_dir,
+        args = summary_args(
             quality=True,
             tiles=True,
             errors=True,
-            all=False,
-            read_lengths=None,
             format="json",
             output=output_file,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = summary.execute(args)
@@ -358,8 +231,7 @@ class TestSummaryJSONFormat:
         assert output_file.exists()
 
         # Verify JSON content
-        with output_file.open() as f:
-            data = json.load(f)
+        data = json.loads(output_file.read_bytes())
         assert "run_name" in data
         assert "tiles" in data
         assert "quality" in data
@@ -370,26 +242,12 @@ class TestSummaryCSVFormat:
     """Tests for CSV output format."""
 
     def test_summary_csv_to_stdout(
-        self, run_dir, tile_metric_file, quality_metric_file, capsys
+        self, summary_args, tile_metric_file, quality_metric_file, capsys
     ):
         """Test CSV output to stdout - only one category to avoid field mismatches."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
+        args = summary_args(
             tiles=True,  # Only tiles
-            errors=False,
-            all=False,
-            read_lengths=None,
             format="csv",
-            output=None,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
         )
 
         result = summary.execute(args)
@@ -401,67 +259,10 @@ class TestSummaryCSVFormat:
         assert len(lines) > 1  # Header + at least one row
         assert "category" in lines[0]
 
-    def test_summary_csv_to_file(
-        self,
-        run_dir,
-        tile_metric_file,
-        quality_metric_file,
-        error_metric_file,
-        tmp_path,
-    ):
-        """Test CSV output to file - note: CSV with mixed categories has limitations."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
+    def test_summary_csv_flattens_data(self, summary_args, tile_metric_file, tmp_path):
+        """Test CSV output to a file and that it flattens nested data."""
         output_file = tmp_path / "summary.csv"
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
-            tiles=True,  # Only tiles to avoid mixed field issues
-            errors=False,
-            all=False,
-            read_lengths=None,
-            format="csv",
-            output=output_file,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
-
-        result = summary.execute(args)
-        assert result == 0
-        assert output_file.exists()
-
-        # Verify CSV content
-        with output_file.open() as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-        assert len(rows) >= 1  # tiles
-        assert all("category" in row for row in rows)
-
-    def test_summary_csv_flattens_data(self, run_dir, tile_metric_file, tmp_path):
-        """Test that CSV format properly flattens nested data."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
-        output_file = tmp_path / "summary.csv"
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
-            tiles=True,
-            errors=False,
-            all=False,
-            read_lengths=None,
-            format="csv",
-            output=output_file,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = summary_args(tiles=True, format="csv", output=output_file)
 
         result = summary.execute(args)
         assert result == 0
@@ -481,28 +282,11 @@ class TestSummaryTableFormat:
     """Tests for table output format with file."""
 
     def test_summary_table_with_file_shows_warning(
-        self, run_dir, tile_metric_file, tmp_path, capsys
+        self, summary_args, tile_metric_file, tmp_path, capsys
     ):
         """Test that table format shows warning when output file is specified."""
-        # Create SampleSheet.csv
-        sample_sheet = run_dir / "SampleSheet.csv"
-        sample_sheet.write_text("[Header]\nInvestigatorName,Test\n")
-
         output_file = tmp_path / "summary.txt"
-        args = argparse.Namespace(
-            run_dir=run_dir,
-            quality=False,
-            tiles=True,
-            errors=False,
-            all=False,
-            read_lengths=None,
-            format="table",
-            output=output_file,
-            verbosity=0,
-            quiet=False,
-            debug=False,
-            verbose=False,
-        )
+        args = summary_args(tiles=True, output=output_file)
 
         result = summary.execute(args)
         assert result == 0